@@ -0,0 +1,97 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+Databases created by ``Base.metadata.create_all`` before migrations existed
+already have these tables; they are skipped so ``alembic upgrade head`` can
+adopt such a database without a manual ``alembic stamp``.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Offline (--sql) runs have no connection to inspect
+    existing = set() if op.get_context().as_sql else set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'crews' not in existing:
+        op.create_table(
+            'crews',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('description', sa.String(), nullable=False),
+            sa.Column('process_type', sa.String(), server_default='sequential'),
+            sa.Column('memory', sa.Boolean(), server_default='true'),
+            sa.Column('verbose', sa.Boolean(), server_default='true'),
+            sa.Column('max_rpm', sa.Integer(), server_default='10'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if 'agents' not in existing:
+        op.create_table(
+            'agents',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('role', sa.String(), nullable=False),
+            sa.Column('goal', sa.String(), nullable=False),
+            sa.Column('backstory', sa.String(), nullable=False),
+            sa.Column('memory', sa.Boolean(), server_default='true'),
+            sa.Column('verbose', sa.Boolean(), server_default='true'),
+            sa.Column('allow_delegation', sa.Boolean(), server_default='false'),
+            sa.Column('tools', postgresql.ARRAY(sa.String()), server_default='{}'),
+            sa.Column('max_iterations', sa.Integer(), server_default='5'),
+            sa.Column('max_rpm', sa.Integer(), server_default='10'),
+            sa.Column('async_mode', sa.Boolean(), server_default='false'),
+            sa.Column('expertise_level', sa.String(), nullable=False, server_default='intermediate'),
+            sa.Column('process_type', sa.String(), nullable=False, server_default='sequential'),
+            sa.Column('custom_tools', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if 'crew_agents' not in existing:
+        op.create_table(
+            'crew_agents',
+            sa.Column('crew_id', sa.String(), sa.ForeignKey('crews.id'), primary_key=True),
+            sa.Column('agent_id', sa.String(), sa.ForeignKey('agents.id'), primary_key=True),
+        )
+
+    if 'tasks' not in existing:
+        op.create_table(
+            'tasks',
+            sa.Column('id', sa.String(), primary_key=True),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('expected_output', sa.Text(), nullable=False),
+            sa.Column('context', postgresql.ARRAY(sa.String()), server_default='{}'),
+            sa.Column('tools', postgresql.ARRAY(sa.String()), server_default='{}'),
+            sa.Column('dependencies', postgresql.ARRAY(sa.String()), server_default='{}'),
+            sa.Column('agent_id', sa.String(), sa.ForeignKey('agents.id')),
+            sa.Column('crew_id', sa.String(), sa.ForeignKey('crews.id')),
+            sa.Column('status', sa.String(), server_default='pending'),
+            sa.Column('output', sa.Text()),
+            sa.Column('output_file', sa.String()),
+            sa.Column('async_mode', sa.Boolean(), server_default='false'),
+            sa.Column('max_iterations', sa.Integer(), server_default='10'),
+            sa.Column('max_rpm', sa.Integer(), server_default='10'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('tasks')
+    op.drop_table('crew_agents')
+    op.drop_table('agents')
+    op.drop_table('crews')
@@ -0,0 +1,40 @@
+"""Add lookup and pagination indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+Indexes are built CONCURRENTLY so existing tables stay writable, and with
+IF NOT EXISTS because databases created by ``create_all`` may already have them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_tasks_agent_id', 'tasks', ['agent_id']),
+    ('ix_tasks_crew_id', 'tasks', ['crew_id']),
+    ('ix_crew_agents_agent_id', 'crew_agents', ['agent_id']),
+    ('ix_crews_created_at_id', 'crews', ['created_at', 'id']),
+    ('ix_agents_created_at_id', 'agents', ['created_at', 'id']),
+    ('ix_tasks_created_at_id', 'tasks', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
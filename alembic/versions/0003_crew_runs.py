@@ -0,0 +1,45 @@
+"""Add crew_runs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+Stores one row per crew execution with its status and resource usage.
+Skipped when ``create_all`` already created the table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Offline (--sql) runs have no connection to inspect
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table('crew_runs'):
+        return
+
+    op.create_table(
+        'crew_runs',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('crew_id', sa.String(), sa.ForeignKey('crews.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='running'),
+        sa.Column('inputs', sa.JSON()),
+        sa.Column('error', sa.Text()),
+        sa.Column('execution_time', sa.Float()),
+        sa.Column('resource_usage', sa.JSON()),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('finished_at', sa.DateTime(timezone=True)),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_crew_runs_crew_id_created_at', 'crew_runs', ['crew_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_crew_runs_crew_id_created_at', table_name='crew_runs')
+    op.drop_table('crew_runs')
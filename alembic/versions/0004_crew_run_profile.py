@@ -0,0 +1,31 @@
+"""Add crew_runs.profile
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:30:00.000000
+
+Collapsed stacks from the sampling profiler, for runs executed with profile=true.
+Skipped when ``create_all`` already added the column.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Offline (--sql) runs have no connection to inspect
+    if not op.get_context().as_sql:
+        columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('crew_runs')}
+        if 'profile' in columns:
+            return
+    op.add_column('crew_runs', sa.Column('profile', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('crew_runs', 'profile')
@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_write_db, get_read_db
 from app.services.agent_service import AgentService
-from app.schemas.agent import Agent, AgentCreate, AgentUpdate
+from app.utils.pagination import set_next_cursor
+from app.utils.projection import resolve_columns, projection_response
+from app.utils.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
+from app.models.agent import Agent as AgentModel
+from app.schemas.agent import Agent, AgentCreate, AgentUpdate, AgentBulkCreate, AgentBulkUpdate
+from app.schemas.bulk import BulkResult, BulkDelete
 
 router = APIRouter()
 
-async def get_agent_service(db: AsyncSession = Depends(get_db)) -> AgentService:
+AGENT_SUMMARY_FIELDS = ("id", "name", "role")
+
+async def get_agent_service(db: AsyncSession = Depends(get_write_db)) -> AgentService:
+    return AgentService(db)
+
+async def get_agent_read_service(db: AsyncSession = Depends(get_read_db)) -> AgentService:
+    """Service bound to a read replica when one is configured"""
     return AgentService(db)
 
 @router.post("", response_model=Agent)
@@ -17,22 +28,97 @@ async def create_agent(
 ):
     return await service.create_agent(agent)
 
+# Bulk routes are declared before /{agent_id} so "bulk" is not taken for an ID
+@router.post("/bulk", response_model=BulkResult)
+async def create_agents(
+    bulk: AgentBulkCreate,
+    service: AgentService = Depends(get_agent_service)
+):
+    """Create up to MAX_BULK_ITEMS agents in one transaction; IDs are returned in request order"""
+    try:
+        return BulkResult(ids=await service.create_agents(bulk.agents, bulk.crew_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk", response_model=BulkResult)
+async def update_agents(
+    bulk: AgentBulkUpdate,
+    service: AgentService = Depends(get_agent_service)
+):
+    """Apply partial updates to several agents in one transaction; fails as a whole if any ID is unknown"""
+    try:
+        return BulkResult(ids=await service.update_agents(bulk.agents))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def delete_agents(
+    bulk: BulkDelete,
+    service: AgentService = Depends(get_agent_service)
+):
+    """Delete several agents in one transaction; returns the IDs that existed"""
+    try:
+        return BulkResult(ids=await service.delete_agents(bulk.ids))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("", response_model=List[Agent])
 async def list_agents(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    service: AgentService = Depends(get_agent_service)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: AgentService = Depends(get_agent_read_service)
 ):
-    return await service.list_agents(skip, limit)
+    """List agents ordered by creation; pass the X-Next-Cursor header back as `cursor` for the next page
+
+    `fields=id,name` or `view=summary` return only those columns, read without loading relationships.
+    """
+    try:
+        columns = resolve_columns(AgentModel, fields, view, AGENT_SUMMARY_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The page depends on the query string as well as the table contents
+    etag = make_etag("agents", *await service.get_agents_version(), request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    try:
+        if columns is not None:
+            rows = await service.list_agent_columns(columns, skip, limit, cursor)
+            projected = projection_response(rows, columns, limit)
+            set_cache_headers(projected, etag)
+            return projected
+        agents = await service.list_agents(skip, limit, cursor)
+    except ValueError as e:
+        if cursor and "Invalid cursor" in str(e):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    set_next_cursor(response, agents, limit)
+    set_cache_headers(response, etag)
+    return agents
 
 @router.get("/{agent_id}", response_model=Agent)
 async def get_agent(
     agent_id: str,
-    service: AgentService = Depends(get_agent_service)
+    request: Request,
+    response: Response,
+    service: AgentService = Depends(get_agent_read_service)
 ):
+    updated_at = await service.get_agent_version(agent_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    etag = make_etag("agent", agent_id, updated_at)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+
     agent = await service.get_agent(agent_id)
     if agent is None:
         raise HTTPException(status_code=404, detail="Agent not found")
+    set_cache_headers(response, etag, updated_at)
     return agent
 
 @router.put("/{agent_id}", response_model=Agent)
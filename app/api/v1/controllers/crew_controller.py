@@ -1,19 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, Body, Query
 from typing import List, Set, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_write_db, get_read_db
 from app.services.crew_service import CrewService
-from app.schemas.crew import Crew, CrewCreate, CrewUpdate
+from app.utils.pagination import set_next_cursor
+from app.utils.projection import resolve_columns, projection_response
+from app.utils.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
+from app.models.crew import Crew as CrewModel
+from app.schemas.crew import Crew, CrewCreate, CrewUpdate, CrewAgentIds
+from app.schemas.bulk import BulkResult
+from app.schemas.crew_document import CrewDocument
+from app.schemas.crew_run import CrewRun
 from app.engine.websocket import ws_manager
+from app.engine.models import Verbosity
+from fastapi.responses import PlainTextResponse
 import logging
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-async def get_crew_service(db: AsyncSession = Depends(get_db)) -> CrewService:
+CREW_SUMMARY_FIELDS = ("id", "name", "process_type")
+
+async def get_crew_service(db: AsyncSession = Depends(get_write_db)) -> CrewService:
+    return CrewService(db)
+
+async def get_crew_read_service(db: AsyncSession = Depends(get_read_db)) -> CrewService:
+    """Service bound to a read replica when one is configured"""
     return CrewService(db)
 
 @router.post("", response_model=Crew)
@@ -23,22 +38,76 @@ async def create_crew(
 ):
     return await service.create_crew(crew)
 
+@router.post("/import", response_model=Crew)
+async def import_crew(
+    document: CrewDocument,
+    service: CrewService = Depends(get_crew_service)
+):
+    """Create a crew with all its agents and tasks from an exported crew document, atomically"""
+    try:
+        crew_id = await service.import_crew(document)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await service.get_crew(crew_id)
+
 @router.get("", response_model=List[Crew])
 async def list_crews(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    service: CrewService = Depends(get_crew_service)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: CrewService = Depends(get_crew_read_service)
 ):
-    return await service.list_crews(skip, limit)
+    """List crews ordered by creation; pass the X-Next-Cursor header back as `cursor` for the next page
+
+    `fields=id,name` or `view=summary` return only those columns, read without loading relationships.
+    """
+    try:
+        columns = resolve_columns(CrewModel, fields, view, CREW_SUMMARY_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The page depends on the query string as well as the table contents
+    etag = make_etag("crews", *await service.get_crews_version(), request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    try:
+        if columns is not None:
+            rows = await service.list_crew_columns(columns, skip, limit, cursor)
+            projected = projection_response(rows, columns, limit)
+            set_cache_headers(projected, etag)
+            return projected
+        crews = await service.list_crews(skip, limit, cursor)
+    except ValueError as e:
+        if cursor and "Invalid cursor" in str(e):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    set_next_cursor(response, crews, limit)
+    set_cache_headers(response, etag)
+    return crews
 
 @router.get("/{crew_id}", response_model=Crew)
 async def get_crew(
     crew_id: str,
-    service: CrewService = Depends(get_crew_service)
+    request: Request,
+    response: Response,
+    service: CrewService = Depends(get_crew_read_service)
 ):
+    version = await service.get_crew_version(crew_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Crew not found")
+    # No Last-Modified: deleting a member agent changes the crew without bumping any timestamp
+    etag = make_etag("crew", crew_id, *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
     crew = await service.get_crew(crew_id)
     if crew is None:
         raise HTTPException(status_code=404, detail="Crew not found")
+    set_cache_headers(response, etag)
     return crew
 
 @router.put("/{crew_id}", response_model=Crew)
@@ -62,6 +131,28 @@ async def delete_crew(
         raise HTTPException(status_code=404, detail="Crew not found")
     return {"message": "Crew deleted successfully"}
 
+# Declared before /{crew_id}/agents/{agent_id} so "bulk" is not taken for an agent ID
+@router.post("/{crew_id}/agents/bulk", response_model=BulkResult)
+async def add_agents_to_crew(
+    crew_id: str,
+    body: CrewAgentIds,
+    service: CrewService = Depends(get_crew_service)
+):
+    """Add several agents to a crew in one statement; returns the IDs that were not members yet"""
+    added = await service.add_agents_to_crew(crew_id, body.agent_ids)
+    if added is None:
+        raise HTTPException(status_code=404, detail="Crew or Agent not found")
+    return BulkResult(ids=added)
+
+@router.post("/{crew_id}/agents/bulk/delete", response_model=BulkResult)
+async def remove_agents_from_crew(
+    crew_id: str,
+    body: CrewAgentIds,
+    service: CrewService = Depends(get_crew_service)
+):
+    """Remove several agents from a crew in one statement; returns the IDs that were members"""
+    return BulkResult(ids=await service.remove_agents_from_crew(crew_id, body.agent_ids))
+
 @router.post("/{crew_id}/agents/{agent_id}", response_model=Crew)
 async def add_agent_to_crew(
     crew_id: str,
@@ -85,10 +176,31 @@ async def remove_agent_from_crew(
     return crew
 
 @router.websocket("/{crew_id}/ws")
-async def websocket_endpoint(websocket: WebSocket, crew_id: str):
-    """WebSocket endpoint for crew execution monitoring"""
+async def websocket_endpoint(
+    websocket: WebSocket,
+    crew_id: str,
+    events: Optional[str] = None,
+    verbosity: Verbosity = Verbosity.VERBOSE,
+    max_rate: Optional[float] = None,
+    compression: Optional[str] = None
+):
+    """WebSocket endpoint for crew execution monitoring
+
+    Optional query parameters narrow the stream: ``events`` (comma separated),
+    ``verbosity`` and ``max_rate`` (events per second). ``compression=deflate``
+    delivers large frames as zlib-compressed binary messages.
+    """
     try:
-        await ws_manager.connect(websocket, crew_id)
+        connected = await ws_manager.connect(
+            websocket,
+            crew_id,
+            events=events.split(",") if events else None,
+            verbosity=verbosity,
+            max_rate=max_rate if max_rate and max_rate > 0 else None,
+            compression=compression
+        )
+        if not connected:
+            return
         logger.info(f"WebSocket client connected for crew {crew_id}")
         
         try:
@@ -109,6 +221,7 @@ async def websocket_endpoint(websocket: WebSocket, crew_id: str):
 
 class CrewExecuteRequest(BaseModel):
     inputs: Optional[Dict[str, str]] = {}
+    profile: bool = False  # sample the run and keep a flamegraph-ready profile
 
 @router.post("/{crew_id}/execute")
 async def execute_crew(
@@ -126,12 +239,72 @@ async def execute_crew(
         Dict containing execution results
     """
     logger.info(f"Executing crew {crew_id} with inputs: {request.inputs}")
-    return await service.execute_crew(crew_id, request.inputs)
+    return await service.execute_crew(crew_id, request.inputs, profile=request.profile)
+
+@router.get("/{crew_id}/runs", response_model=List[CrewRun])
+async def list_crew_runs(
+    crew_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    service: CrewService = Depends(get_crew_read_service)
+):
+    """Most recent executions of the crew, with their resource usage"""
+    try:
+        return await service.list_runs(crew_id, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{crew_id}/runs/{run_id}", response_model=CrewRun)
+async def get_crew_run(
+    crew_id: str,
+    run_id: str,
+    service: CrewService = Depends(get_crew_read_service)
+):
+    """One execution of the crew with its status and resource usage"""
+    try:
+        run = await service.get_run(crew_id, run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+@router.get("/{crew_id}/runs/{run_id}/profile", response_class=PlainTextResponse)
+async def get_crew_run_profile(
+    crew_id: str,
+    run_id: str,
+    service: CrewService = Depends(get_crew_read_service)
+):
+    """Download the run's profile as collapsed stacks (flamegraph.pl, speedscope, inferno)"""
+    try:
+        profile = await service.get_run_profile(crew_id, run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if profile is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this run")
+    return PlainTextResponse(
+        profile,
+        headers={"Content-Disposition": f'attachment; filename="{run_id}.collapsed"'}
+    )
+
+@router.get("/{crew_id}/export", response_model=CrewDocument)
+async def export_crew(
+    crew_id: str,
+    service: CrewService = Depends(get_crew_read_service)
+):
+    """Export the crew, its agents and its tasks (with dependencies) as a portable crew document"""
+    try:
+        document = await service.export_crew(crew_id)
+    except ValidationError as e:
+        # Stored data the document format cannot represent
+        raise HTTPException(status_code=422, detail=f"Crew cannot be exported: {e.errors(include_url=False)}")
+    if document is None:
+        raise HTTPException(status_code=404, detail="Crew not found")
+    return document
 
 @router.get("/{crew_id}/variables", response_model=Set[str])
 async def get_crew_variables(
     crew_id: str,
-    service: CrewService = Depends(get_crew_service)
+    service: CrewService = Depends(get_crew_read_service)
 ):
     """Get all required variables for a crew's execution"""
     try:
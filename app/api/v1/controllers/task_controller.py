@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from app.core.database import get_write_db, get_read_db
 from app.services.task_service import TaskService
-from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskStatus
+from app.utils.pagination import set_next_cursor
+from app.utils.projection import resolve_columns, projection_response
+from app.utils.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
+from app.models.task import Task as TaskModel
+from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskStatus, TaskBulkCreate, TaskBulkUpdate
+from app.schemas.bulk import BulkResult, BulkDelete
 
 router = APIRouter()
 
-async def get_task_service(db: AsyncSession = Depends(get_db)) -> TaskService:
+TASK_SUMMARY_FIELDS = ("id", "name", "status", "agent_id", "crew_id")
+
+async def get_task_service(db: AsyncSession = Depends(get_write_db)) -> TaskService:
+    return TaskService(db)
+
+async def get_task_read_service(db: AsyncSession = Depends(get_read_db)) -> TaskService:
+    """Service bound to a read replica when one is configured"""
     return TaskService(db)
 
 @router.post("", response_model=Task)
@@ -17,22 +28,97 @@ async def create_task(
 ):
     return await service.create_task(task)
 
+# Bulk routes are declared before /{task_id} so "bulk" is not taken for an ID
+@router.post("/bulk", response_model=BulkResult)
+async def create_tasks(
+    bulk: TaskBulkCreate,
+    service: TaskService = Depends(get_task_service)
+):
+    """Create up to MAX_BULK_ITEMS tasks in one transaction; IDs are returned in request order"""
+    try:
+        return BulkResult(ids=await service.create_tasks(bulk.tasks))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk", response_model=BulkResult)
+async def update_tasks(
+    bulk: TaskBulkUpdate,
+    service: TaskService = Depends(get_task_service)
+):
+    """Apply partial updates to several tasks in one transaction; fails as a whole if any ID is unknown"""
+    try:
+        return BulkResult(ids=await service.update_tasks(bulk.tasks))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def delete_tasks(
+    bulk: BulkDelete,
+    service: TaskService = Depends(get_task_service)
+):
+    """Delete several tasks in one transaction; returns the IDs that existed"""
+    try:
+        return BulkResult(ids=await service.delete_tasks(bulk.ids))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("", response_model=List[Task])
 async def list_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    service: TaskService = Depends(get_task_service)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    service: TaskService = Depends(get_task_read_service)
 ):
-    return await service.list_tasks(skip, limit)
+    """List tasks ordered by creation; pass the X-Next-Cursor header back as `cursor` for the next page
+
+    `fields=id,name` or `view=summary` return only those columns, read without loading relationships.
+    """
+    try:
+        columns = resolve_columns(TaskModel, fields, view, TASK_SUMMARY_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The page depends on the query string as well as the table contents
+    etag = make_etag("tasks", *await service.get_tasks_version(), request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    try:
+        if columns is not None:
+            rows = await service.list_task_columns(columns, skip, limit, cursor)
+            projected = projection_response(rows, columns, limit)
+            set_cache_headers(projected, etag)
+            return projected
+        tasks = await service.list_tasks(skip, limit, cursor)
+    except ValueError as e:
+        if cursor and "Invalid cursor" in str(e):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    set_next_cursor(response, tasks, limit)
+    set_cache_headers(response, etag)
+    return tasks
 
 @router.get("/{task_id}", response_model=Task)
 async def get_task(
     task_id: str,
-    service: TaskService = Depends(get_task_service)
+    request: Request,
+    response: Response,
+    service: TaskService = Depends(get_task_read_service)
 ):
+    updated_at = await service.get_task_version(task_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    etag = make_etag("task", task_id, updated_at)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+
     task = await service.get_task(task_id)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+    set_cache_headers(response, etag, updated_at)
     return task
 
 @router.put("/{task_id}", response_model=Task)
@@ -66,7 +152,7 @@ async def list_agent_tasks(
 @router.get("/crew/{crew_id}", response_model=List[Task])
 async def list_crew_tasks(
     crew_id: str,
-    service: TaskService = Depends(get_task_service)
+    service: TaskService = Depends(get_task_read_service)
 ):
     return await service.get_tasks_by_crew(crew_id)
 
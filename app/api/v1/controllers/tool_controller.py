@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_db
 from app.services.tool_service import ToolService
 from app.schemas.tool import ToolResponse, ToolSchema
+from app.utils.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
 
 router = APIRouter()
 
@@ -11,8 +13,19 @@ async def get_tool_service(db: AsyncSession = Depends(get_db)) -> ToolService:
 
 @router.get("", response_model=ToolResponse)
 async def list_tools(
+    request: Request,
+    response: Response,
     service: ToolService = Depends(get_tool_service)
 ):
-    """List all available tools."""
+    """List all available tools.
+
+    The list only changes when custom tools are registered, so clients may reuse it
+    for TOOLS_CACHE_MAX_AGE seconds and revalidate with the ETag afterwards.
+    """
     tools = await service.list_tools()
-    return ToolResponse(tools=[ToolSchema(**tool) for tool in tools]) 
\ No newline at end of file
+    etag = make_etag("tools", *sorted((tool["name"], tool["description"]) for tool in tools))
+    cache_control = f"public, max-age={settings.TOOLS_CACHE_MAX_AGE}"
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control=cache_control)
+    set_cache_headers(response, etag, cache_control=cache_control)
+    return ToolResponse(tools=[ToolSchema(**tool) for tool in tools])
\ No newline at end of file
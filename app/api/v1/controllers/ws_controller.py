@@ -0,0 +1,86 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import Any, Dict
+from pydantic import ValidationError
+from app.engine.models import SubscriptionRequest
+from app.engine.websocket import ws_manager, crew_topic, run_topic
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.websocket("/ws")
+async def multiplexed_websocket(websocket: WebSocket):
+    """Single WebSocket carrying events for any number of crew/run subscriptions
+
+    Clients send messages such as
+    ``{"action": "subscribe", "crew_id": "...", "events": ["task_end", "execution_completed"]}``
+    or ``{"action": "unsubscribe", "run_id": "..."}``. Subscriptions may also set a
+    ``verbosity`` (progress, normal, verbose) and a ``max_rate`` in events per second.
+
+    The server sends ``{"type": "ping"}`` every ``WS_HEARTBEAT_INTERVAL`` seconds;
+    clients must send something (e.g. ``{"action": "pong"}``) within ``WS_IDLE_TIMEOUT``.
+
+    Subscribing with ``"compression": "deflate"`` makes the server send frames
+    above ``WS_COMPRESSION_THRESHOLD`` as zlib-compressed binary messages.
+    """
+    if not await ws_manager.accept(websocket, heartbeat=True):
+        return
+    try:
+        while True:
+            data = await websocket.receive_text()
+            ws_manager.touch(websocket)
+            try:
+                request = SubscriptionRequest.model_validate_json(data)
+            except ValidationError as e:
+                await ws_manager.send_direct_message(websocket, {
+                    'type': 'error',
+                    'payload': {'message': 'Invalid subscription message', 'detail': e.errors(include_url=False, include_context=False)}
+                })
+                continue
+
+            if request.action == "pong":
+                continue
+            if request.action == "ping":
+                await ws_manager.send_direct_message(websocket, {'type': 'pong', 'payload': {}})
+                continue
+
+            topic = crew_topic(request.crew_id) if request.crew_id else run_topic(request.run_id)
+            if request.action == "subscribe" and ws_manager.is_crew_full(websocket, topic):
+                await ws_manager.send_direct_message(websocket, {
+                    'type': 'error',
+                    'payload': {'message': f'Connection limit reached for {topic}', 'topic': topic}
+                })
+            elif request.action == "subscribe":
+                if request.compression == "deflate":
+                    ws_manager.enable_compression(websocket)
+                subscription = await ws_manager.subscribe(
+                    websocket, topic, request.events, request.verbosity, request.max_rate
+                )
+                await ws_manager.send_direct_message(websocket, {
+                    'type': 'subscribed',
+                    'payload': {
+                        'topic': topic,
+                        'events': sorted(subscription.events) if subscription.events else None,
+                        'verbosity': subscription.verbosity,
+                        'max_rate': subscription.max_rate,
+                        'compression': 'deflate' if websocket in ws_manager.compressed_connections else None
+                    }
+                })
+            else:
+                await ws_manager.unsubscribe(websocket, topic)
+                await ws_manager.send_direct_message(websocket, {
+                    'type': 'unsubscribed',
+                    'payload': {'topic': topic}
+                })
+    except WebSocketDisconnect:
+        logger.debug("Multiplexed WebSocket client disconnected")
+    except Exception as e:
+        logger.error(f"Multiplexed WebSocket error: {str(e)}")
+    finally:
+        await ws_manager.disconnect(websocket)
+
+@router.get("/ws/stats")
+async def websocket_stats() -> Dict[str, Any]:
+    """Live WebSocket connection counts for this process"""
+    return ws_manager.stats()
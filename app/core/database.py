@@ -1,7 +1,16 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Any, Dict, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import registry, db_pool_checkout_seconds
+from app.core.query_stats import install_query_stats
 import asyncpg
+import itertools
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,11 +44,109 @@ async def ensure_database_exists():
         logger.error(f"Error ensuring database exists: {e}")
         raise
 
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=False,
-    future=True
-)
+class PoolMetrics:
+    """Counters for connection pool usage, fed by pool events"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.wait_time_total += seconds
+        if seconds > self.wait_time_max:
+            self.wait_time_max = seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_time_total": round(self.wait_time_total, 6),
+            "wait_time_max": round(self.wait_time_max, 6),
+            "wait_time_avg": round(self.wait_time_total / self.checkouts, 6) if self.checkouts else 0.0,
+        }
+
+# Per engine ("primary", "replica1", ...), so replica traffic never blurs the primary's figures
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long checkouts wait for a connection"""
+
+    engine_name = "primary"
+    metrics: Optional[PoolMetrics] = None
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; keep reporting into the same metrics
+        new_pool = super().recreate()
+        new_pool.engine_name, new_pool.metrics = self.engine_name, self.metrics
+        return new_pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            if self.metrics is not None:
+                self.metrics.record_wait(waited)
+            db_pool_checkout_seconds.observe(waited, engine=self.engine_name)
+
+def create_engine(database_uri: Optional[str] = None, name: str = "primary") -> AsyncEngine:
+    """Create an async engine with the pool settings from ``Settings``
+
+    ``name`` labels the engine's pool metrics.
+    """
+    new_engine = create_async_engine(
+        database_uri or settings.SQLALCHEMY_DATABASE_URI,
+        echo=settings.DB_ECHO,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+    sync_engine = new_engine.sync_engine
+    metrics = pool_metrics[name] = PoolMetrics()
+    sync_engine.pool.engine_name, sync_engine.pool.metrics = name, metrics
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    if settings.DB_QUERY_STATS:
+        install_query_stats(sync_engine)
+
+    return new_engine
+
+# The single engine (and pool) of this worker process
+engine = create_engine()
 
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -54,4 +161,82 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+# Optional read replicas, used round-robin by get_read_db
+replica_engines = [
+    create_engine(uri, name=f"replica{index}") for index, uri in enumerate(settings.DATABASE_REPLICA_URIS, 1)
+]
+_replica_sessions = itertools.cycle([
+    sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+    for replica_engine in replica_engines
+])
+
+# Set after a client's write so its next reads see that write
+PRIMARY_STICKY_COOKIE = "db_read_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+async def get_write_db(request: Request, response: Response):
+    """Primary session; mutating requests pin the client's reads to the primary for a while"""
+    if replica_engines and request.method not in SAFE_METHODS:
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            "1",
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax"
+        )
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints: a replica unless the client wrote recently"""
+    session_factory = AsyncSessionLocal
+    if replica_engines and PRIMARY_STICKY_COOKIE not in request.cookies:
+        session_factory = next(_replica_sessions)
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+def _engine_pool_stats(pool_engine: AsyncEngine) -> Dict[str, Any]:
+    pool = pool_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        **pool.metrics.as_dict(),
+    }
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Primary pool occupancy plus cumulative checkout/wait metrics; replicas reported separately"""
+    stats = _engine_pool_stats(engine)
+    if replica_engines:
+        stats["replicas"] = {
+            replica_engine.pool.engine_name: _engine_pool_stats(replica_engine) for replica_engine in replica_engines
+        }
+    return stats
+
+def _pool_connections() -> Dict[Tuple[str, str], int]:
+    connections = {}
+    for pool_engine in (engine, *replica_engines):
+        stats = _engine_pool_stats(pool_engine)
+        for state in ("size", "checked_out", "checked_in", "overflow"):
+            connections[(pool_engine.pool.engine_name, state)] = stats[state]
+    return connections
+
+registry.gauge(
+    "db_pool_connections", "Pooled database connections by engine and state", _pool_connections, ["engine", "state"]
+)
\ No newline at end of file
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DatabaseHealthMonitor:
+    """Probes the database in the background and caches the result
+
+    Request handling only reads ``is_healthy``. The circuit opens after
+    ``DB_HEALTH_FAILURE_THRESHOLD`` consecutive failures (from probes or from
+    database errors reported by request handlers) and closes again on the
+    next successful probe, which runs more often while the circuit is open.
+    """
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.last_checked: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.last_latency: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.consecutive_failures < settings.DB_HEALTH_FAILURE_THRESHOLD
+
+    def record_success(self, latency: Optional[float] = None):
+        if not self.is_healthy:
+            logger.info("Database connection restored")
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.last_latency = latency
+
+    def record_failure(self, error: str):
+        was_healthy = self.is_healthy
+        self.consecutive_failures += 1
+        self.last_error = error
+        if was_healthy and not self.is_healthy:
+            logger.error(f"Database marked unhealthy after {self.consecutive_failures} failures: {error}")
+
+    async def _select_one(self):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def probe(self) -> bool:
+        """Run one ``SELECT 1`` against the pool and record the outcome"""
+        start = time.perf_counter()
+        try:
+            # The timeout covers the pool checkout and connecting too, not just the query
+            await asyncio.wait_for(self._select_one(), timeout=settings.DB_HEALTH_TIMEOUT)
+            self.record_success(time.perf_counter() - start)
+            return True
+        except Exception as e:
+            self.record_failure(str(e) or e.__class__.__name__)
+            return False
+        finally:
+            self.last_checked = datetime.utcnow()
+
+    async def _run(self):
+        # start() has just probed, so wait before the next one
+        while True:
+            interval = settings.DB_HEALTH_CHECK_INTERVAL if self.is_healthy else settings.DB_HEALTH_RETRY_INTERVAL
+            await asyncio.sleep(interval)
+            await self.probe()
+
+    async def start(self):
+        """Probe once, then keep probing in the background"""
+        await self.probe()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.is_healthy,
+            "consecutive_failures": self.consecutive_failures,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+            "last_error": self.last_error,
+            "latency_ms": round(self.last_latency * 1000, 2) if self.last_latency is not None else None,
+        }
+
+# Create a global instance
+db_health = DatabaseHealthMonitor()
@@ -1,19 +1,55 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from colorlog import ColoredFormatter
+from app.core.config import settings
 
-def setup_logging():
-    # Remove all existing handlers
-    root_logger = logging.getLogger()
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    
-    # Configure root logger
-    root_logger.setLevel(logging.INFO)
-    
-    # Create console handler with colored formatter
-    console_handler = logging.StreamHandler(sys.stdout)
-    colored_formatter = ColoredFormatter(
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with their message resolved but layout left to the listener's formatter"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args now since they may change after the call; tracebacks can't cross threads as objects
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def _colored_formatter() -> logging.Formatter:
+    return ColoredFormatter(
         "%(cyan)s%(asctime)s%(reset)s - "
         "%(log_color)s%(levelname)-8s%(reset)s - "
         "%(blue)s%(name)s%(reset)s:"
@@ -30,9 +66,51 @@ def setup_logging():
         secondary_log_colors={},
         style='%'
     )
-    console_handler.setFormatter(colored_formatter)
-    root_logger.addHandler(console_handler)
-    
-    # Set third-party loggers to WARNING to reduce noise
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    logging.getLogger("httpx").setLevel(logging.WARNING)
\ No newline at end of file
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    levels: Optional[Dict[str, str]] = None
+):
+    """Configure the root logger from LOG_LEVEL, LOG_FORMAT, LOG_QUEUE and LOG_LEVELS
+
+    With LOG_QUEUE the root logger only enqueues records; a listener thread
+    formats them and writes to stdout, so the event loop never blocks on I/O.
+    """
+    global _listener
+    stop_logging()
+
+    # Remove all existing handlers
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+
+    root_logger.setLevel((level or settings.LOG_LEVEL).upper())
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    if (log_format or settings.LOG_FORMAT) == "json":
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(_colored_formatter())
+
+    if settings.LOG_QUEUE if use_queue is None else use_queue:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(_QueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root_logger.addHandler(console_handler)
+
+    # Per-module levels, e.g. {"uvicorn.access": "WARNING", "app.engine": "DEBUG"}
+    for name, module_level in (settings.LOG_LEVELS if levels is None else levels).items():
+        logging.getLogger(name).setLevel(module_level.upper())
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread, if any"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
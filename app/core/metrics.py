@@ -0,0 +1,196 @@
+"""In-process metrics with Prometheus text exposition
+
+Writers never take a lock: every thread updates its own shard of each metric
+and a scrape sums the shards. Crew execution callbacks run in worker threads,
+so this keeps them from contending with the event loop.
+"""
+import bisect
+import math
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LONG_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._shards: Dict[int, dict] = {}
+
+    def _shard(self) -> dict:
+        # Each thread only ever writes its own shard; setdefault is atomic
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            shard = self._shards.setdefault(ident, {})
+        return shard
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in list(self._shards.values()):
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            # Per-bucket (non-cumulative) counts, then sum and count
+            cell = shard[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        cell[0][bisect.bisect_left(self.buckets, value)] += 1
+        cell[1] += value
+        cell[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str):
+        """Observe the duration of the with-block"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def values(self) -> Dict[LabelValues, list]:
+        totals: Dict[LabelValues, list] = {}
+        for shard in list(self._shards.values()):
+            for key, (counts, total, count) in list(shard.items()):
+                merged = totals.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total, count) in sorted(self.values().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+class Gauge(_Metric):
+    """Value read at scrape time from a callback returning a number or {label values: number}"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, collect: Callable[[], object], labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        value = self.collect()
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key if isinstance(key, tuple) else (key,))} {_format_value(v)}"
+            for key, v in items
+        ]
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name: str, help: str, collect: Callable[[], object], labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, collect, labels))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# Crew execution
+execution_phase_seconds = registry.histogram(
+    "crew_execution_phase_seconds", "Duration of CrewRunner.execute phases", ["phase"], LONG_BUCKETS
+)
+executions_total = registry.counter("crew_executions_total", "Finished crew executions", ["status"])
+tool_call_seconds = registry.histogram("crew_tool_call_seconds", "Tool call latency", ["tool"], LONG_BUCKETS)
+llm_call_seconds = registry.histogram("crew_llm_call_seconds", "LLM call latency", [], LONG_BUCKETS)
+
+# Database
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection", ["engine"],
+    (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+# WebSockets
+websocket_broadcast_seconds = registry.histogram(
+    "websocket_broadcast_seconds", "Time to fan a status update out to its subscribers", [],
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+websocket_frames_total = registry.counter("websocket_frames_total", "Frames sent to WebSocket clients", ["variant"])
+
+# HTTP
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,119 @@
+"""Per-request SQL statement counting for development and tests
+
+With ``DB_QUERY_STATS`` set, every engine gets cursor event listeners that add
+each statement and its duration to the ``QueryStats`` of the current request
+(a context variable set by ``RequestMiddleware``). The middleware reports the
+totals in ``X-DB-Queries``/``X-DB-Time``, warns about statements repeated
+within one request (the usual N+1 signature) and enforces query budgets.
+Without the setting no listeners are installed and nothing is counted.
+
+Tests and scripts use ``count_queries`` to count the statements of a block
+regardless of the setting and ``assert_query_budget`` to fail when they exceed
+an endpoint's budget.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request issues more statements than its budget"""
+
+class QueryStats:
+    """Statements issued while handling one request
+
+    Statements are also recorded in ``parent``, so a request's stats nest
+    inside a ``count_queries`` block.
+    """
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.time = 0.0
+        self.statements: Counter = Counter()
+        self.parent = parent
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.time += seconds
+        self.statements[statement] += 1
+        if self.parent is not None:
+            self.parent.record(statement, seconds)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Identical statements run at least ``threshold`` times, most frequent first"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+# Set for the duration of each HTTP request while DB_QUERY_STATS is enabled
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# The start time lives on the execution context, which is discarded with the
+# statement, so a statement that raises leaves nothing behind on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats_var.get()
+    start = getattr(context, "_query_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+def install_query_stats(sync_engine: Engine) -> None:
+    """Count the statements of ``sync_engine`` (an AsyncEngine's ``sync_engine``); installs once"""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def count_queries(sync_engine: Engine) -> Iterator[QueryStats]:
+    """Count the statements ``sync_engine`` runs inside the block, with or without DB_QUERY_STATS
+
+    Requests sent in the block through an in-process client (httpx.ASGITransport)
+    are counted too::
+
+        with count_queries(engine.sync_engine) as stats:
+            await client.get("/api/v1/crews")
+        assert_query_budget(stats, "GET", "/api/v1/crews")
+    """
+    install_query_stats(sync_engine)
+    stats = QueryStats(parent=query_stats_var.get())
+    token = query_stats_var.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_var.reset(token)
+
+def query_budget(method: str, route: str) -> int:
+    """Statement budget of an endpoint, 0 for none; keys look like ``"GET /api/v1/crews/{crew_id}"``"""
+    return settings.DB_QUERY_BUDGETS.get(f"{method} {route}", settings.DB_QUERY_BUDGET)
+
+def check_query_stats(stats: QueryStats, method: str, route: str) -> None:
+    """Warn about repeated statements and enforce the endpoint's budget"""
+    endpoint = f"{method} {route}"
+    threshold = settings.DB_QUERY_REPEAT_THRESHOLD
+    if threshold:
+        for statement, count in stats.repeated(threshold):
+            logger.warning(
+                "Possible N+1 in %s: statement ran %d times: %s",
+                endpoint, count, " ".join(statement.split())[:200]
+            )
+
+    budget = query_budget(method, route)
+    if budget and stats.count > budget:
+        message = f"{endpoint} issued {stats.count} SQL statements, budget is {budget}"
+        if settings.DB_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+def assert_query_budget(stats: QueryStats, method: str, route: str, budget: Optional[int] = None) -> None:
+    """Raise AssertionError when ``stats`` exceeds ``budget``, by default the endpoint's configured one"""
+    budget = query_budget(method, route) if budget is None else budget
+    if budget and stats.count > budget:
+        raise AssertionError(f"{method} {route} issued {stats.count} SQL statements, budget is {budget}")
@@ -0,0 +1,116 @@
+"""Optional OpenTelemetry tracing
+
+Spans are only recorded when ``TRACING_ENABLED`` is set and the OpenTelemetry
+SDK is installed; otherwise every helper here is a cheap no-op, so callers
+never need to check. The SDK is only imported by ``setup_tracing`` when tracing
+is enabled, so workers without it don't pay for the import. Spans are exported
+to an OTLP/HTTP collector or, for local digging, appended as JSON lines to
+``TRACING_FILE``.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OpenTelemetry API pieces, set by setup_tracing
+trace = None
+Status = None
+StatusCode = None
+
+_provider = None
+_tracer = None
+_trace_file = None
+
+def _attributes(attributes: dict) -> dict:
+    # OpenTelemetry rejects None values
+    return {key: value for key, value in attributes.items() if value is not None}
+
+def _exporter():
+    global _trace_file
+    if settings.TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        _trace_file = open(settings.TRACING_FILE, "a")
+        return ConsoleSpanExporter(out=_trace_file, formatter=lambda span: span.to_json(indent=None) + "\n")
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+def setup_tracing(app=None) -> bool:
+    """Install the tracer provider; returns whether spans will be recorded"""
+    global _provider, _tracer, trace, Status, StatusCode
+    if not settings.TRACING_ENABLED:
+        return False
+    try:
+        from opentelemetry import trace as otel_trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.trace import Status as OtelStatus, StatusCode as OtelStatusCode
+    except ImportError:  # tracing is an optional extra
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+        return False
+    try:
+        exporter = _exporter()
+    except ImportError:
+        logger.warning("opentelemetry-exporter-otlp-proto-http is not installed; tracing disabled")
+        return False
+
+    _provider = TracerProvider(resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}))
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer(__name__)
+    trace, Status, StatusCode = otel_trace, OtelStatus, OtelStatusCode
+
+    if app is not None:
+        # HTTP server spans become the parents of the service spans when available
+        try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            FastAPIInstrumentor.instrument_app(app, tracer_provider=_provider, excluded_urls="health,ready,metrics")
+        except ImportError:
+            logger.debug("opentelemetry-instrumentation-fastapi not installed; no HTTP server spans")
+
+    logger.info("Tracing enabled, exporting to %s", settings.TRACING_EXPORTER)
+    return True
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and stop the exporter"""
+    global _provider, _tracer, _trace_file
+    if _provider is not None:
+        _provider.shutdown()
+    if _trace_file is not None:
+        _trace_file.close()
+    _provider = _tracer = _trace_file = None
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """Trace the with-block as a child of the current span; yields the span or None"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+def start_span(name: str, parent: Optional[Any] = None, **attributes: Any) -> Optional[Any]:
+    """Start a span that is ended later with ``end_span``, e.g. across two callbacks
+
+    ``parent`` is a span from ``span``/``start_span``; without it the current
+    context is used.
+    """
+    if _tracer is None:
+        return None
+    context = trace.set_span_in_context(parent) if parent is not None else None
+    return _tracer.start_span(name, context=context, attributes=_attributes(attributes))
+
+def end_span(current: Optional[Any], error: Optional[str] = None) -> None:
+    if current is None:
+        return
+    if error:
+        current.set_status(Status(StatusCode.ERROR, error))
+    current.end()
+
+def set_attributes(current: Optional[Any], **attributes: Any) -> None:
+    if current is not None:
+        current.set_attributes(_attributes(attributes))
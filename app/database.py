@@ -1,30 +1,14 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from app.core.database import engine, AsyncSessionLocal, get_db
 
-# Create async engine
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=True,
-    future=True
-)
-
-# Create async session factory
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+# The engine, session factory and get_db dependency live in app.core.database
+# so every worker holds a single connection pool.
 
 Base = declarative_base()
 
-# Dependency for FastAPI
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close() 
\ No newline at end of file
+__all__ = [
+    "Base",
+    "engine",
+    "AsyncSessionLocal",
+    "get_db"
+]
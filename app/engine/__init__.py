@@ -1,10 +1,26 @@
-from app.engine.runner import CrewRunner
 from app.engine.models import EngineStatus, EngineConfig
 from app.engine.websocket import WebSocketManager
 
+def load_runner():
+    """The CrewRunner class, importing crewai on first use
+
+    crewai and its LLM stack take seconds and a lot of memory to import, so
+    API-only workers never load them; execution workers can pay the cost at
+    startup with PRELOAD_EXECUTION_ENGINE.
+    """
+    from app.engine.runner import CrewRunner
+    return CrewRunner
+
+def __getattr__(name):
+    # Keeps `from app.engine import CrewRunner` working, at the price of the crewai import
+    if name == "CrewRunner":
+        return load_runner()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "CrewRunner",
     "EngineStatus",
     "EngineConfig",
-    "WebSocketManager"
-] 
\ No newline at end of file
+    "WebSocketManager",
+    "load_runner"
+]
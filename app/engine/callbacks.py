@@ -2,33 +2,59 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 import asyncio
+from time import perf_counter
 from crewai import Agent, Task
-from app.engine.models import AgentState, ExecutionState, StatusUpdate, EngineStatus
+from app.engine.models import AgentState, ExecutionState, ExecutionStateDelta, StatusUpdate, EngineStatus
+from app.engine.state import ExecutionStateTracker
 from app.engine.websocket import WebSocketManager
+from app.engine.resources import ResourceTracker
+from app.core.metrics import tool_call_seconds, llm_call_seconds
+from app.core.tracing import start_span, end_span
 
 logger = logging.getLogger(__name__)
 
 class CrewCallbackHandler:
     """Callback handler for CrewAI execution events"""
     
-    def __init__(self, websocket_manager: WebSocketManager, crew_id: str, agent_id_map: Dict[str, str], task_id_map: Dict[str, str]):
+    def __init__(self, websocket_manager: WebSocketManager, crew_id: str, agent_id_map: Dict[str, str], task_id_map: Dict[str, str], run_id: Optional[str] = None, snapshot_interval: int = 50, resource_tracker: Optional[ResourceTracker] = None):
         self.ws_manager = websocket_manager
         self.crew_id = crew_id
+        self.run_id = run_id
         self.agent_id_map = agent_id_map  # name -> id mapping
         self.task_id_map = task_id_map    # description -> id mapping
         self.execution_state = ExecutionState()
-        logger.info(f"Initialized CrewCallbackHandler for crew {crew_id}")
-        logger.info(f"Agent ID mappings: {agent_id_map}")
-        logger.info(f"Task ID mappings: {task_id_map}")
+        self.resources = resource_tracker or ResourceTracker()
+        self._state_tracker = ExecutionStateTracker(snapshot_interval)
+        # Start times of in-flight tool and LLM calls, for latency metrics
+        self._tool_started: Dict[tuple, float] = {}
+        self._chain_started: Dict[str, float] = {}
+        # Open trace spans; the runner points trace_parent at its kickoff span
+        self.trace_parent = None
+        self._task_spans: Dict[str, Any] = {}
+        self._tool_spans: Dict[tuple, Any] = {}
+        # crewai invokes callbacks from the kickoff thread, so keep the loop to post updates to
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        logger.debug("Initialized CrewCallbackHandler for crew %s", crew_id)
+        logger.debug("Agent ID mappings: %s", agent_id_map)
+        logger.debug("Task ID mappings: %s", task_id_map)
         
     def on_tool_start(self, agent: Agent, tool_name: str, input_args: Dict[str, Any]) -> None:
         """Called when an agent starts using a tool"""
+        self._tool_started[(agent.name, tool_name)] = perf_counter()
+        self._tool_spans[(agent.name, tool_name)] = start_span(
+            f"tool.{tool_name}",
+            parent=self._task_spans.get(agent.name) or self.trace_parent,
+            crew_id=self.crew_id, run_id=self.run_id, agent=agent.name, tool=tool_name
+        )
         agent_id = self.agent_id_map.get(agent.name)
-        logger.debug(f"Tool start - Agent: {agent.name} (ID: {agent_id}), Tool: {tool_name}")
+        logger.debug("Tool start - Agent: %s (ID: %s), Tool: %s", agent.name, agent_id, tool_name)
         
         if agent_id:
             # Update agent state using agent name as key
-            self.execution_state.agent_states[agent.name] = AgentState.EXECUTING.value
+            self.execution_state.agent_states[agent.name] = AgentState.EXECUTING
             
             # Set as current agent if not already set
             if not self.execution_state.current_agent_name:
@@ -36,9 +62,9 @@ class CrewCallbackHandler:
                 self.execution_state.current_agent_name = agent.name
             
             # Log the event
-            logger.info(f"Agent {agent.name} using tool {tool_name}")
+            logger.debug("Agent %s using tool %s", agent.name, tool_name)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "tool_start",
                 f"Agent {agent.name} using tool {tool_name}",
                 {
@@ -47,21 +73,27 @@ class CrewCallbackHandler:
                     "tool": tool_name,
                     "input": str(input_args)[:200]  # Include truncated input for context
                 }
-            ))
+            )
         else:
             logger.warning(f"No ID mapping found for agent {agent.name}")
 
     def on_tool_end(self, agent: Agent, tool_name: str, response: str) -> None:
         """Called when an agent finishes using a tool"""
+        started = self._tool_started.pop((agent.name, tool_name), None)
+        if started is not None:
+            elapsed = perf_counter() - started
+            tool_call_seconds.observe(elapsed, tool=tool_name)
+            self.resources.record_tool_call(agent.name, tool_name, elapsed)
+        end_span(self._tool_spans.pop((agent.name, tool_name), None))
         agent_id = self.agent_id_map.get(agent.name)
         if agent_id:
             # Keep the agent in EXECUTING state as they might use another tool
-            self.execution_state.agent_states[agent.name] = AgentState.EXECUTING.value
+            self.execution_state.agent_states[agent.name] = AgentState.EXECUTING
             
             # Log the event
-            logger.info(f"Agent {agent.name} finished using tool {tool_name}")
+            logger.debug("Agent %s finished using tool %s", agent.name, tool_name)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "tool_end",
                 f"Agent {agent.name} finished using {tool_name}",
                 {
@@ -70,7 +102,7 @@ class CrewCallbackHandler:
                     "tool": tool_name,
                     "response": response[:200]  # Include truncated response
                 }
-            ))
+            )
         else:
             logger.warning(f"No ID mapping found for agent {agent.name}")
 
@@ -79,20 +111,25 @@ class CrewCallbackHandler:
         agent_id = self.agent_id_map.get(agent.name)
         task_id = self.task_id_map.get(task.description)
         
-        logger.debug(f"Task start - Agent: {agent.name} (ID: {agent_id}), Task: {task.description} (ID: {task_id})")
+        logger.debug("Task start - Agent: %s (ID: %s), Task: %s (ID: %s)", agent.name, agent_id, task.description, task_id)
+        self._task_spans[agent.name] = start_span(
+            "task", parent=self.trace_parent,
+            crew_id=self.crew_id, run_id=self.run_id, agent=agent.name, task=task.description[:200]
+        )
+        self.resources.task_started(agent, task.description)
         
         if agent_id and task_id:
             self.execution_state.current_agent_id = agent_id
             self.execution_state.current_agent_name = agent.name
             self.execution_state.current_task_id = task_id
             self.execution_state.current_task_name = task.description
-            self.execution_state.agent_states[agent.name] = AgentState.EXECUTING.value
+            self.execution_state.agent_states[agent.name] = AgentState.EXECUTING
             self.execution_state.task_progress[task_id] = 0.0
             
             # Log the event
-            logger.info(f"Agent {agent.name} started task: {task.description}")
+            logger.info("Agent %s started task %s", agent.name, task_id)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "task_start",
                 f"Agent {agent.name} started task: {task.description}",
                 {
@@ -101,91 +138,122 @@ class CrewCallbackHandler:
                     "task_id": task_id,
                     "task_name": task.description
                 }
-            ))
+            )
         else:
             logger.warning(f"Missing ID mapping - Agent: {agent.name} -> {agent_id}, Task: {task.description} -> {task_id}")
 
     def on_task_end(self, agent: Agent, task: Task, output: str) -> None:
         """Called when an agent completes a task"""
+        end_span(self._task_spans.pop(agent.name, None))
+        self.resources.task_finished(agent, task.description)
         agent_id = self.agent_id_map.get(agent.name)
         task_id = self.task_id_map.get(task.description)
         
         if agent_id and task_id:
-            self.execution_state.agent_states[agent.name] = AgentState.IDLE.value
+            self.execution_state.agent_states[agent.name] = AgentState.IDLE
             self.execution_state.task_progress[task_id] = 1.0
             
             # Log the event
-            logger.info(f"Agent {agent.name} completed task: {task.description}")
-            logger.info(f"Output: {output[:200]}...")
+            logger.info("Agent %s completed task %s", agent.name, task_id)
+            logger.debug("Output: %.200s...", output)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "task_end",
                 f"Agent {agent.name} completed task: {task.description}",
                 {"output": output[:500]}
-            ))
+            )
 
     def on_chain_start(self, agent: Agent, task: Task) -> None:
         """Called when an agent starts its thinking process"""
+        self._chain_started[agent.name] = perf_counter()
         agent_id = self.agent_id_map.get(agent.name)
         if agent_id:
-            self.execution_state.agent_states[agent.name] = AgentState.THINKING.value
+            self.execution_state.agent_states[agent.name] = AgentState.THINKING
             
             # Log the event
-            logger.info(f"Agent {agent.name} is thinking about task: {task.description}")
+            logger.debug("Agent %s is thinking about task: %s", agent.name, task.description)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "chain_start",
                 f"Agent {agent.name} is thinking about task: {task.description}",
-            ))
+            )
 
     def on_chain_end(self, agent: Agent, task: Task, response: str) -> None:
         """Called when an agent completes its thinking process"""
+        started = self._chain_started.pop(agent.name, None)
+        if started is not None:
+            elapsed = perf_counter() - started
+            llm_call_seconds.observe(elapsed)
+            self.resources.record_llm_call(agent.name, elapsed)
         agent_id = self.agent_id_map.get(agent.name)
         if agent_id:
             self.execution_state.agent_thoughts[agent.name] = response[:500]
             
             # Log the event
-            logger.info(f"Agent {agent.name} finished thinking")
-            logger.info(f"Thought process: {response[:200]}...")
+            logger.debug("Agent %s finished thinking", agent.name)
+            logger.debug("Thought process: %.200s...", response)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "chain_end",
                 f"Agent {agent.name} finished thinking",
                 {"thought": response[:500]}
-            ))
+            )
 
     def on_human_input_start(self, agent: Agent, task: Task) -> None:
         """Called when human input is requested"""
         agent_id = self.agent_id_map.get(agent.name)
         if agent_id:
-            self.execution_state.agent_states[agent.name] = AgentState.WAITING.value
+            self.execution_state.agent_states[agent.name] = AgentState.WAITING
             
             # Log the event
-            logger.info(f"Agent {agent.name} is waiting for human input on task: {task.description}")
+            logger.info("Agent %s is waiting for human input on task: %s", agent.name, task.description)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "human_input_start",
                 f"Agent {agent.name} is waiting for human input on task: {task.description}",
-            ))
+            )
 
     def on_human_input_end(self, agent: Agent, task: Task, response: str) -> None:
         """Called when human input is received"""
         agent_id = self.agent_id_map.get(agent.name)
         if agent_id:
             # Log the event
-            logger.info(f"Agent {agent.name} received human input")
-            logger.info(f"Input: {response[:200]}...")
+            logger.info("Agent %s received human input", agent.name)
+            logger.debug("Input: %.200s...", response)
             
-            asyncio.create_task(self._send_update(
+            self._emit(
                 "human_input_end",
                 f"Agent {agent.name} received human input",
                 {"input": response[:500]}
-            ))
+            )
+
+    def _emit(self, event: str, message: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Schedule a status update, skipping it entirely when no subscriber wants the event"""
+        if not self.ws_manager or not self.ws_manager.has_subscribers(self.crew_id, event, self.run_id):
+            return
+
+        # Version the state at event time; subscribers receive only what changed
+        snapshot, delta = self._state_tracker.commit(self.execution_state)
+        coroutine = self._send_update(event, message, data, snapshot, delta)
+        try:
+            asyncio.get_running_loop().create_task(coroutine)
+        except RuntimeError:
+            if self._loop is None or self._loop.is_closed():
+                coroutine.close()
+                return
+            asyncio.run_coroutine_threadsafe(coroutine, self._loop)
 
-    async def _send_update(self, event: str, message: str, data: Optional[Dict[str, Any]] = None):
+    async def _send_update(
+        self,
+        event: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[ExecutionState] = None,
+        delta: Optional[ExecutionStateDelta] = None
+    ):
         """Send a status update via WebSocket"""
         try:
-            logger.debug(f"Sending WebSocket update - Event: {event}, Message: {message}")
+            logger.debug("Sending WebSocket update - Event: %s, Message: %s", event, message)
             
             status_update = StatusUpdate(
                 event=event,
@@ -193,11 +261,12 @@ class CrewCallbackHandler:
                 message=message,
                 crew_id=self.crew_id,
                 data=data,
-                execution_state=self.execution_state,
+                execution_state=snapshot,
+                state_delta=delta,
                 timestamp=datetime.utcnow()
             )
             
-            await self.ws_manager.broadcast_status(status_update, self.crew_id)
+            await self.ws_manager.broadcast_status(status_update, self.crew_id, self.run_id)
             logger.debug("WebSocket update sent successfully")
         except Exception as e:
             logger.error(f"Failed to send WebSocket update: {str(e)}", exc_info=True)
@@ -1,5 +1,5 @@
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional, Set, Union
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 from enum import Enum
 from datetime import datetime
 
@@ -9,12 +9,14 @@ class EngineStatus(str, Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     ERROR = "error"
+    FAILED = "failed"
 
 class EngineConfig(BaseModel):
     """Configuration for the crew engine"""
     max_concurrent_tasks: int = Field(default=5, description="Maximum number of concurrent tasks")
     execution_timeout: int = Field(default=3600, description="Execution timeout in seconds")
     retry_attempts: int = Field(default=3, description="Number of retry attempts for failed tasks")
+    state_snapshot_interval: int = Field(default=50, description="Send a full execution state snapshot every N state versions")
 
 class AgentState(str, Enum):
     IDLE = "idle"
@@ -25,6 +27,7 @@ class AgentState(str, Enum):
 
 class ExecutionState(BaseModel):
     """Current state of crew execution"""
+    version: int = 0
     current_agent_id: Optional[str] = None
     current_agent_name: Optional[str] = None
     current_task_id: Optional[str] = None
@@ -33,6 +36,16 @@ class ExecutionState(BaseModel):
     task_progress: Dict[str, float] = {}  # task_id -> progress
     agent_thoughts: Dict[str, str] = {}  # agent_id -> thought
 
+class ExecutionStateDelta(BaseModel):
+    """Changes to ExecutionState between two versions
+
+    Scalar fields hold their new value; dict fields hold only the changed
+    keys, with ``None`` marking a removed key.
+    """
+    version: int
+    base_version: int
+    changes: Dict[str, Any] = {}
+
 class StatusUpdate(BaseModel):
     """Status update message sent via WebSocket"""
     event: str
@@ -41,6 +54,7 @@ class StatusUpdate(BaseModel):
     crew_id: str
     data: Optional[Dict[str, Any]] = None
     execution_state: Optional[ExecutionState] = None
+    state_delta: Optional[ExecutionStateDelta] = None
     timestamp: datetime
 
 class ExecutionResult(BaseModel):
@@ -50,4 +64,52 @@ class ExecutionResult(BaseModel):
     error: Optional[str] = None
     execution_time: float
     start_time: datetime
-    end_time: Optional[datetime] = None 
\ No newline at end of file
+    end_time: Optional[datetime] = None
+    run_id: Optional[str] = None
+    resource_usage: Dict[str, Any] = Field(default_factory=dict)
+
+class Verbosity(str, Enum):
+    """How much detail a WebSocket subscriber wants, from least to most"""
+    PROGRESS = "progress"  # lifecycle and task boundaries only
+    NORMAL = "normal"      # + setup phases and tool calls
+    VERBOSE = "verbose"    # + agent thoughts and human input
+
+    @property
+    def rank(self) -> int:
+        return list(Verbosity).index(self)
+
+class SubscriptionRequest(BaseModel):
+    """Subscribe/unsubscribe message sent by clients of the multiplexed WebSocket"""
+    action: Literal["subscribe", "unsubscribe", "ping", "pong"]
+    crew_id: Optional[str] = None
+    run_id: Optional[str] = None
+    events: Optional[List[str]] = Field(default=None, description="Only deliver these event types (all when omitted)")
+    verbosity: Verbosity = Field(default=Verbosity.VERBOSE, description="Maximum detail level of delivered events")
+    max_rate: Optional[float] = Field(default=None, gt=0, description="Maximum events per second; extra events are coalesced")
+    compression: Optional[Literal["deflate"]] = Field(default=None, description="Receive large frames as zlib-compressed binary messages")
+
+    @model_validator(mode="after")
+    def check_target(self) -> "SubscriptionRequest":
+        if self.action in ("ping", "pong"):
+            return self
+        if bool(self.crew_id) == bool(self.run_id):
+            raise ValueError("Exactly one of crew_id or run_id must be provided")
+        return self
+
+class Subscription(BaseModel):
+    """A WebSocket client's interest in one topic"""
+    topic: str
+    events: Optional[Set[str]] = None
+    verbosity: Verbosity = Verbosity.VERBOSE
+    max_rate: Optional[float] = None
+
+    # Rate-coalescing state, owned by WebSocketManager
+    _last_sent: float = PrivateAttr(default=0.0)
+    _state_version: int = PrivateAttr(default=-1)  # last ExecutionState version delivered
+    _pending: Optional[Any] = PrivateAttr(default=None)
+    _flush_task: Optional[Any] = PrivateAttr(default=None)
+
+    def accepts(self, event: str, level: Verbosity) -> bool:
+        if self.events is not None and event not in self.events:
+            return False
+        return level.rank <= self.verbosity.rank
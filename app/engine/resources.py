@@ -0,0 +1,174 @@
+import sys
+from typing import Any, Dict, Optional, Set
+from app.core.config import settings
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def _usage_bucket() -> Dict[str, Any]:
+    return {
+        "llm_calls": 0,
+        "llm_time": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "estimated_cost": 0.0,
+        "tool_calls": 0,
+        "tool_time": 0.0,
+    }
+
+def _rounded(buckets: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {
+        name: {key: round(value, 6) if isinstance(value, float) else value for key, value in bucket.items()}
+        for name, bucket in buckets.items()
+    }
+
+# Runs of this process between start() and stop(); only touched from the event loop
+_active_runs: Set["ResourceTracker"] = set()
+
+def _process_usage() -> Optional[tuple]:
+    """(CPU seconds, peak RSS bytes) of this process"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return usage.ru_utime + usage.ru_stime, peak_rss
+
+def token_usage(agent: Any) -> Optional[Dict[str, int]]:
+    """Cumulative token counts crewai keeps per agent, or None when not exposed"""
+    process = getattr(agent, "_token_process", None)
+    if process is None:
+        return None
+    try:
+        summary = process.get_summary()
+    except Exception:
+        return None
+    if not isinstance(summary, dict):
+        summary = summary.model_dump() if hasattr(summary, "model_dump") else vars(summary)
+    return {
+        "prompt_tokens": int(summary.get("prompt_tokens") or 0),
+        "completion_tokens": int(summary.get("completion_tokens") or 0),
+        "successful_requests": int(summary.get("successful_requests") or 0),
+    }
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return round(
+        prompt_tokens / 1000 * settings.LLM_PROMPT_TOKEN_COST
+        + completion_tokens / 1000 * settings.LLM_COMPLETION_TOKEN_COST,
+        6
+    )
+
+class ResourceTracker:
+    """Accumulates what one crew execution consumed, for ExecutionResult.resource_usage
+
+    LLM and tool figures are fed by the callback handler, process figures are
+    sampled around the run and DB time is added by the service. The process
+    figures cover the whole worker, including runs executing at the same time,
+    so they are reported apart together with the number of overlapping runs.
+    """
+
+    def __init__(self):
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.db_time: Dict[str, float] = {}
+        self.kickoff_cpu_time = 0.0
+        self._task_tokens: Dict[str, Optional[Dict[str, int]]] = {}
+        self._current_task: Dict[str, str] = {}  # agent name -> task description
+        self._start_usage: Optional[tuple] = None
+        self._end_usage: Optional[tuple] = None
+        self._overlapping_runs = 0
+
+    def start(self) -> None:
+        self._start_usage = _process_usage()
+        for run in _active_runs:
+            run._overlapping_runs += 1
+        self._overlapping_runs = len(_active_runs)
+        _active_runs.add(self)
+
+    def stop(self) -> None:
+        self._end_usage = _process_usage()
+        _active_runs.discard(self)
+
+    def _buckets(self, agent_name: str):
+        agent = self.agents.setdefault(agent_name, _usage_bucket())
+        task_name = self._current_task.get(agent_name)
+        task = self.tasks.setdefault(task_name, _usage_bucket()) if task_name else None
+        return [bucket for bucket in (agent, task) if bucket is not None]
+
+    def task_started(self, agent: Any, task_name: str) -> None:
+        self._current_task[agent.name] = task_name
+        self.tasks.setdefault(task_name, _usage_bucket())
+        self._task_tokens[task_name] = token_usage(agent)
+
+    def task_finished(self, agent: Any, task_name: str) -> None:
+        # crewai only counts tokens per agent; a task gets the agent's delta over its run
+        before, after = self._task_tokens.pop(task_name, None), token_usage(agent)
+        if before is not None and after is not None:
+            bucket = self.tasks.setdefault(task_name, _usage_bucket())
+            bucket["prompt_tokens"] += after["prompt_tokens"] - before["prompt_tokens"]
+            bucket["completion_tokens"] += after["completion_tokens"] - before["completion_tokens"]
+            bucket["estimated_cost"] = estimate_cost(bucket["prompt_tokens"], bucket["completion_tokens"])
+        if self._current_task.get(agent.name) == task_name:
+            del self._current_task[agent.name]
+
+    def record_llm_call(self, agent_name: str, seconds: float) -> None:
+        for bucket in self._buckets(agent_name):
+            bucket["llm_calls"] += 1
+            bucket["llm_time"] += seconds
+
+    def record_tool_call(self, agent_name: str, tool_name: str, seconds: float) -> None:
+        for bucket in self._buckets(agent_name):
+            bucket["tool_calls"] += 1
+            bucket["tool_time"] += seconds
+        tool = self.tools.setdefault(tool_name, {"calls": 0, "time": 0.0})
+        tool["calls"] += 1
+        tool["time"] += seconds
+
+    def record_agent_tokens(self, agent: Any) -> None:
+        """Take the final per-agent token counts from crewai after kickoff"""
+        usage = token_usage(agent)
+        if usage is None:
+            return
+        bucket = self.agents.setdefault(agent.name, _usage_bucket())
+        bucket["prompt_tokens"] = usage["prompt_tokens"]
+        bucket["completion_tokens"] = usage["completion_tokens"]
+        bucket["estimated_cost"] = estimate_cost(usage["prompt_tokens"], usage["completion_tokens"])
+
+    def add_db_time(self, phase: str, seconds: float) -> None:
+        self.db_time[phase] = self.db_time.get(phase, 0.0) + seconds
+
+    def as_dict(self, execution_time: float) -> Dict[str, Any]:
+        prompt_tokens = sum(bucket["prompt_tokens"] for bucket in self.agents.values())
+        completion_tokens = sum(bucket["completion_tokens"] for bucket in self.agents.values())
+        usage: Dict[str, Any] = {
+            "execution_time": execution_time,
+            "llm": {
+                "calls": sum(bucket["llm_calls"] for bucket in self.agents.values()),
+                "time": round(sum(bucket["llm_time"] for bucket in self.agents.values()), 6),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "estimated_cost": estimate_cost(prompt_tokens, completion_tokens),
+            },
+            "tools": {
+                "calls": sum(tool["calls"] for tool in self.tools.values()),
+                "time": round(sum(tool["time"] for tool in self.tools.values()), 6),
+                "by_tool": _rounded(self.tools),
+            },
+            "agents": _rounded(self.agents),
+            "tasks": _rounded(self.tasks),
+            "cpu_time": {"kickoff_thread": round(self.kickoff_cpu_time, 6)},
+            "db_time": {phase: round(seconds, 6) for phase, seconds in self.db_time.items()},
+        }
+        if self._start_usage is not None and self._end_usage is not None:
+            # Process-wide: with overlapping runs these include their CPU and memory too
+            usage["process"] = {
+                "cpu_time": round(self._end_usage[0] - self._start_usage[0], 6),
+                # The peak is a high-water mark, so this is how far the process raised it during the run
+                "peak_rss_delta_bytes": max(0, self._end_usage[1] - self._start_usage[1]),
+                "overlapping_runs": self._overlapping_runs,
+            }
+        return usage
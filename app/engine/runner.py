@@ -9,12 +9,17 @@ from app.engine.models import EngineStatus, EngineConfig, StatusUpdate, Executio
 from app.engine.schemas import CrewConfig, AgentConfig, TaskConfig
 from app.engine.websocket import WebSocketManager
 from app.engine.callbacks import CrewCallbackHandler
+from app.engine.resources import ResourceTracker
+from app.engine.profiler import SamplingProfiler
+from app.core.metrics import execution_phase_seconds, executions_total
+from app.core.tracing import span
 from app.services.tool_service import ToolService
 from app.models.agent import Agent
 from app.models.task import Task
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import os
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +33,19 @@ class CrewRunner:
         websocket_manager: Optional[WebSocketManager] = None,
         crew_id: Optional[str] = None,
         tool_service: Optional[ToolService] = None,
+        run_id: Optional[str] = None,
+        resource_tracker: Optional[ResourceTracker] = None,
+        profile: bool = False,
     ):
         self.config = config
         self.ws_manager = websocket_manager
         self.crew_id = crew_id
+        self.run_id = run_id
         self.tool_service = tool_service
+        self.resources = resource_tracker or ResourceTracker()
+        # Collapsed stacks of the kickoff thread when profiling was requested
+        self.profiler = SamplingProfiler() if profile else None
+        self.profile_data: Optional[str] = None
         self._status = EngineStatus.INITIALIZING
         self._start_time: Optional[datetime] = None
         self._end_time: Optional[datetime] = None
@@ -48,7 +61,15 @@ class CrewRunner:
                 data=data,
                 timestamp=datetime.utcnow()
             )
-            await self.ws_manager.broadcast_status(status_update, self.crew_id)
+            await self.ws_manager.broadcast_status(status_update, self.crew_id, self.run_id)
+
+    @contextmanager
+    def _phase(self, phase: str):
+        """Time an execution phase as a metric and a trace span; yields the span or None"""
+        with execution_phase_seconds.time(phase=phase), span(
+            f"crew_runner.{phase}", crew_id=self.crew_id, run_id=self.run_id
+        ) as current:
+            yield current
 
     def _get_tools_for_agent(self, tool_names: List[str]) -> List:
         """Convert tool names to actual tool instances"""
@@ -90,7 +111,8 @@ class CrewRunner:
 
     def _create_crewai_task(self, config: TaskConfig, agents: Dict[str, CrewAgent]) -> CrewTask:
         """Create a CrewAI Task from configuration"""
-        logger.info(f"Creating task with config: {json.dumps(config.model_dump(), indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating task with config: %s", json.dumps(config.model_dump(), indent=2))
         
         # Ensure agent exists
         if config.agent_name not in agents:
@@ -115,7 +137,7 @@ class CrewRunner:
             config=task_config
         )
         
-        logger.info(f"Created task for agent {config.agent_name}")
+        logger.debug("Created task for agent %s", config.agent_name)
         return task
 
     async def execute(self, crew_config: CrewConfig) -> ExecutionResult:
@@ -131,6 +153,7 @@ class CrewRunner:
         try:
             self._status = EngineStatus.INITIALIZING
             self._start_time = datetime.utcnow()
+            self.resources.start()
             
             # Initial status update
             await self._send_status(
@@ -143,8 +166,8 @@ class CrewRunner:
             )
             
             # Log the crew configuration
-            logger.info("Crew configuration:")
-            logger.info(json.dumps(crew_config.model_dump(), indent=2))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Crew configuration: %s", json.dumps(crew_config.model_dump(), indent=2))
             
             # Create agents with status update
             await self._send_status(
@@ -153,10 +176,11 @@ class CrewRunner:
                 {"agent_count": len(crew_config.agents)}
             )
             
-            agents = {
-                agent_config.name: self._create_crewai_agent(agent_config)
-                for agent_config in crew_config.agents
-            }
+            with self._phase("create_agents"):
+                agents = {
+                    agent_config.name: self._create_crewai_agent(agent_config)
+                    for agent_config in crew_config.agents
+                }
             
             # Create tasks with status update
             await self._send_status(
@@ -166,13 +190,14 @@ class CrewRunner:
             )
             
             tasks = []
-            for task_config in crew_config.tasks:
-                if task_config.agent_name not in agents:
-                    logger.error(f"Agent {task_config.agent_name} not found for task")
-                    continue
-                    
-                task = self._create_crewai_task(task_config, agents)
-                tasks.append(task)
+            with self._phase("create_tasks"):
+                for task_config in crew_config.tasks:
+                    if task_config.agent_name not in agents:
+                        logger.error(f"Agent {task_config.agent_name} not found for task")
+                        continue
+
+                    task = self._create_crewai_task(task_config, agents)
+                    tasks.append(task)
 
             if not tasks:
                 raise ValueError("No tasks were created")
@@ -181,6 +206,9 @@ class CrewRunner:
             callback_handler = CrewCallbackHandler(
                 websocket_manager=self.ws_manager,
                 crew_id=self.crew_id,
+                run_id=self.run_id,
+                snapshot_interval=self.config.state_snapshot_interval,
+                resource_tracker=self.resources,
                 agent_id_map={agent.name: agent.name for agent in crew_config.agents},  # Use names as IDs
                 task_id_map={task.description: task.description for task in crew_config.tasks}  # Use descriptions as IDs
             )
@@ -198,24 +226,25 @@ class CrewRunner:
 
             process_type = Process.sequential if crew_config.process_type.value == "sequential" else Process.hierarchical
             
-            crew = Crew(
-                agents=list(agents.values()),
-                tasks=tasks,
-                process=process_type,
-                memory=crew_config.memory,
-                verbose=crew_config.verbose,
-                max_rpm=crew_config.max_rpm,
-                callbacks={
-                    "on_tool_start": callback_handler.on_tool_start,
-                    "on_tool_end": callback_handler.on_tool_end,
-                    "on_task_start": callback_handler.on_task_start,
-                    "on_task_end": callback_handler.on_task_end,
-                    "on_chain_start": callback_handler.on_chain_start,
-                    "on_chain_end": callback_handler.on_chain_end,
-                    "on_human_input_start": callback_handler.on_human_input_start,
-                    "on_human_input_end": callback_handler.on_human_input_end
-                }
-            )
+            with self._phase("create_crew"):
+                crew = Crew(
+                    agents=list(agents.values()),
+                    tasks=tasks,
+                    process=process_type,
+                    memory=crew_config.memory,
+                    verbose=crew_config.verbose,
+                    max_rpm=crew_config.max_rpm,
+                    callbacks={
+                        "on_tool_start": callback_handler.on_tool_start,
+                        "on_tool_end": callback_handler.on_tool_end,
+                        "on_task_start": callback_handler.on_task_start,
+                        "on_task_end": callback_handler.on_task_end,
+                        "on_chain_start": callback_handler.on_chain_start,
+                        "on_chain_end": callback_handler.on_chain_end,
+                        "on_human_input_start": callback_handler.on_human_input_start,
+                        "on_human_input_end": callback_handler.on_human_input_end
+                    }
+                )
 
             # Start execution with status update
             self._status = EngineStatus.RUNNING
@@ -230,21 +259,34 @@ class CrewRunner:
 
             # Execute with timeout
             try:
-                logger.info("Starting crew kickoff...")
+                logger.info("Starting crew kickoff for crew %s", self.crew_id)
                 
                 # Run in a separate thread to not block
                 def run_crew():
+                    cpu_start = time.thread_time()
+                    if self.profiler:
+                        self.profiler.start()
                     try:
                         return crew.kickoff(inputs=crew_config.inputs)
                     except Exception as e:
                         logger.error(f"Error in crew kickoff thread: {str(e)}")
                         raise
+                    finally:
+                        self.resources.kickoff_cpu_time += time.thread_time() - cpu_start
+                        if self.profiler:
+                            self.profiler.stop()
+                            self.profile_data = self.profiler.collapsed()
                 
-                result = await asyncio.wait_for(
-                    asyncio.to_thread(run_crew),
-                    timeout=self.config.execution_timeout
-                )
+                with self._phase("kickoff") as kickoff_span:
+                    # Task and tool spans from the callbacks nest under the kickoff
+                    callback_handler.trace_parent = kickoff_span
+                    result = await asyncio.wait_for(
+                        asyncio.to_thread(run_crew),
+                        timeout=self.config.execution_timeout
+                    )
                 logger.info("Crew kickoff completed")
+                for agent in agents.values():
+                    self.resources.record_agent_tokens(agent)
             except asyncio.TimeoutError:
                 logger.error(f"Execution timed out after {self.config.execution_timeout} seconds")
                 raise Exception(f"Execution timed out after {self.config.execution_timeout} seconds")
@@ -255,9 +297,10 @@ class CrewRunner:
             # Execution completed successfully
             self._status = EngineStatus.COMPLETED
             self._end_time = datetime.utcnow()
+            self.resources.stop()
             
             execution_time = (self._end_time - self._start_time).total_seconds()
-            logger.info(f"Execution completed in {execution_time} seconds")
+            logger.info("Execution completed in %.2f seconds", execution_time)
             
             await self._send_status(
                 "execution_completed",
@@ -274,32 +317,36 @@ class CrewRunner:
             
             # Try to extract task outputs if available
             try:
-                for task in tasks:  # Use our task list instead of crew.tasks
-                    task_id = task.description  # Use description as ID
-                    output_dict["tasks"][task_id] = {
-                        "description": task.description,
-                        "agent": task.agent.name if hasattr(task.agent, "name") else "Unknown",
-                        "output": task.output if hasattr(task, "output") else None,
-                        "status": task.status if hasattr(task, "status") else None
-                    }
+                with self._phase("collect_output"):
+                    for task in tasks:  # Use our task list instead of crew.tasks
+                        task_id = task.description  # Use description as ID
+                        output_dict["tasks"][task_id] = {
+                            "description": task.description,
+                            "agent": task.agent.name if hasattr(task.agent, "name") else "Unknown",
+                            "output": task.output if hasattr(task, "output") else None,
+                            "status": task.status if hasattr(task, "status") else None
+                        }
             except Exception as e:
                 logger.warning(f"Could not extract task outputs: {str(e)}")
 
+            executions_total.inc(status="completed")
+
             return ExecutionResult(
                 status=self._status,
                 output=output_dict,
                 execution_time=execution_time,
                 start_time=self._start_time,
                 end_time=self._end_time,
-                resource_usage={
-                    "execution_time": execution_time
-                }
+                run_id=self.run_id,
+                resource_usage=self.resources.as_dict(execution_time)
             )
 
         except Exception as e:
             logger.error(f"Crew execution failed: {str(e)}", exc_info=True)
+            executions_total.inc(status="failed")
             self._status = EngineStatus.FAILED
             self._end_time = datetime.utcnow()
+            self.resources.stop()
             
             error_message = str(e)
             await self._send_status(
@@ -317,9 +364,8 @@ class CrewRunner:
                 execution_time=execution_time,
                 start_time=self._start_time,
                 end_time=self._end_time,
-                resource_usage={
-                    "execution_time": execution_time
-                }
+                run_id=self.run_id,
+                resource_usage=self.resources.as_dict(execution_time)
             ) 
 
     async def get_agent_by_name(self, name: str) -> Optional[Dict]:
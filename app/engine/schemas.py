@@ -133,8 +133,8 @@ def create_crew_config_from_json(json_data: Dict) -> CrewConfig:
         }
     }
     """
-    logger.info("Creating crew configuration from JSON")
-    logger.info(f"Input data: {json.dumps(json_data, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Creating crew configuration from JSON: %s", json.dumps(json_data, indent=2))
     
     # Convert process type
     process_type = ProcessType.from_str(json_data.get("process_type", "sequential"))
@@ -193,5 +193,5 @@ def create_crew_config_from_json(json_data: Dict) -> CrewConfig:
         inputs=json_data.get("inputs")
     )
     
-    logger.info("Crew configuration created successfully from JSON")
+    logger.debug("Crew configuration created successfully from JSON")
     return config 
\ No newline at end of file
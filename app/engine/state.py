@@ -0,0 +1,44 @@
+from typing import Any, Dict, Optional, Tuple
+from app.engine.models import ExecutionState, ExecutionStateDelta
+
+def diff_state(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the changed fields between two dumped ExecutionStates"""
+    changes: Dict[str, Any] = {}
+    for field, value in current.items():
+        old = previous.get(field)
+        if isinstance(value, dict):
+            old = old or {}
+            changed = {key: item for key, item in value.items() if old.get(key) != item}
+            changed.update({key: None for key in old if key not in value})
+            if changed:
+                changes[field] = changed
+        elif field not in previous or value != old:
+            changes[field] = value
+    return changes
+
+class ExecutionStateTracker:
+    """Versions an ExecutionState and produces delta frames between versions
+
+    Every ``snapshot_interval`` versions the tracker omits the delta so the
+    update carries a full snapshot and lagging clients resynchronize.
+    """
+
+    def __init__(self, snapshot_interval: int = 50):
+        self.snapshot_interval = max(snapshot_interval, 1)
+        self.version = 0
+        self._last: Dict[str, Any] = {}
+
+    def commit(self, state: ExecutionState) -> Tuple[ExecutionState, Optional[ExecutionStateDelta]]:
+        """Record the current state; returns the versioned snapshot and the delta to send"""
+        current = state.model_dump(mode="json", exclude={"version"})
+        changes = diff_state(self._last, current)
+        base_version = self.version
+        if changes:
+            self.version += 1
+            self._last = current
+        state.version = self.version
+
+        snapshot = ExecutionState.model_construct(version=self.version, **current)
+        if changes and (base_version == 0 or self.version % self.snapshot_interval == 0):
+            return snapshot, None
+        return snapshot, ExecutionStateDelta(version=self.version, base_version=base_version, changes=changes)
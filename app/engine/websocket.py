@@ -1,8 +1,12 @@
-from typing import Set, Dict, Optional, ClassVar
+from typing import Any, Set, Dict, List, Optional, ClassVar, Tuple
 import json
+import time
+import zlib
 import asyncio
 from fastapi import WebSocket
-from app.engine.models import StatusUpdate
+from app.core.config import settings
+from app.core.metrics import registry, websocket_broadcast_seconds, websocket_frames_total
+from app.engine.models import StatusUpdate, Subscription, Verbosity, ExecutionState, ExecutionStateDelta
 import logging
 from datetime import datetime
 
@@ -41,8 +45,106 @@ def adapt_message_for_frontend(status_update: StatusUpdate) -> Dict:
         }
     }
 
+def crew_topic(crew_id: str) -> str:
+    """Topic carrying every event of a crew"""
+    return f"crew:{crew_id}"
+
+def run_topic(run_id: str) -> str:
+    """Topic carrying the events of a single execution run"""
+    return f"run:{run_id}"
+
+def event_name(status_update: StatusUpdate) -> str:
+    """Event type used for subscription filtering"""
+    return getattr(status_update, 'event', None) or str(status_update.status)
+
+# Detail level of each event; unknown events are treated as NORMAL
+EVENT_VERBOSITY: Dict[str, Verbosity] = {
+    'started': Verbosity.PROGRESS,
+    'completed': Verbosity.PROGRESS,
+    'error': Verbosity.PROGRESS,
+    'execution_started': Verbosity.PROGRESS,
+    'execution_running': Verbosity.PROGRESS,
+    'execution_completed': Verbosity.PROGRESS,
+    'execution_failed': Verbosity.PROGRESS,
+    'task_start': Verbosity.PROGRESS,
+    'task_end': Verbosity.PROGRESS,
+    'creating_agents': Verbosity.NORMAL,
+    'creating_tasks': Verbosity.NORMAL,
+    'creating_crew': Verbosity.NORMAL,
+    'tool_start': Verbosity.NORMAL,
+    'tool_end': Verbosity.NORMAL,
+    'chain_start': Verbosity.VERBOSE,
+    'chain_end': Verbosity.VERBOSE,
+    'human_input_start': Verbosity.VERBOSE,
+    'human_input_end': Verbosity.VERBOSE,
+}
+
+# Events that bypass rate limiting so clients always see how a run ends
+TERMINAL_EVENTS = {'completed', 'error', 'execution_completed', 'execution_failed'}
+
+def event_verbosity(event: str) -> Verbosity:
+    return EVENT_VERBOSITY.get(event, Verbosity.NORMAL)
+
+class BroadcastFrame:
+    """A broadcast message, encoded at most once per execution-state variant
+
+    Subscribers already holding ``delta.base_version`` get the small delta
+    frame; anyone else (new or coalesced subscribers) gets a full snapshot.
+    Compressed bytes are likewise produced once per variant and shared.
+    """
+
+    def __init__(
+        self,
+        message: Dict[str, Any],
+        state: Optional[ExecutionState] = None,
+        delta: Optional[ExecutionStateDelta] = None
+    ):
+        self.message = message
+        self.state = state
+        self.delta = delta
+        self.version = state.version if state is not None else None
+        self._encoded: Dict[str, str] = {}
+        self._compressed: Dict[str, bytes] = {}
+
+    def variant_for(self, subscription: Subscription) -> str:
+        if self.state is None:
+            return 'plain'
+        if self.delta is not None and subscription._state_version == self.delta.base_version:
+            return 'delta' if self.delta.changes else 'plain'
+        return 'snapshot'
+
+    def encode(self, variant: str) -> str:
+        if variant not in self._encoded:
+            payload = dict(self.message['payload'])
+            if variant == 'delta':
+                payload['state_delta'] = self.delta.model_dump()
+            elif variant == 'snapshot':
+                payload['state'] = self.state.model_dump(mode='json', warnings=False)
+            self._encoded[variant] = json.dumps({**self.message, 'payload': payload})
+        return self._encoded[variant]
+
+    def compress(self, variant: str) -> Optional[bytes]:
+        """zlib-compressed frame, or None when it is below the compression threshold"""
+        text = self.encode(variant)
+        if len(text) < settings.WS_COMPRESSION_THRESHOLD:
+            return None
+        if variant not in self._compressed:
+            self._compressed[variant] = zlib.compress(text.encode(), settings.WS_COMPRESSION_LEVEL)
+        return self._compressed[variant]
+
 class WebSocketManager:
-    """Manages WebSocket connections and broadcasts status updates"""
+    """Manages WebSocket connections and broadcasts status updates
+
+    Connections subscribe to topics (``crew:<id>`` or ``run:<id>``); a single
+    socket may hold any number of subscriptions, each with its own event filter.
+
+    Heartbeat clients (the multiplexed endpoint) receive ``ping`` frames and are
+    closed once silent for ``WS_IDLE_TIMEOUT``; other sockets rely on the
+    server's protocol-level pings and are dropped on the first failed send.
+
+    Sockets that opt into compression receive frames above
+    ``WS_COMPRESSION_THRESHOLD`` as zlib-compressed binary messages.
+    """
     
     _instance: ClassVar[Optional['WebSocketManager']] = None
     _lock: ClassVar[asyncio.Lock] = asyncio.Lock()
@@ -50,54 +152,265 @@ class WebSocketManager:
     def __new__(cls) -> 'WebSocketManager':
         if not cls._instance:
             cls._instance = super(WebSocketManager, cls).__new__(cls)
-            cls._instance.active_connections = {}
+            cls._instance.topics = {}
+            cls._instance.connection_topics = {}
+            cls._instance.latest_states = {}
+            cls._instance.heartbeat_connections = {}
+            cls._instance.compressed_connections = set()
+            cls._instance._reaper_task = None
             cls._instance._connection_lock = asyncio.Lock()
         return cls._instance
 
     def __init__(self):
         # Initialize only if not already initialized
-        if not hasattr(self, 'active_connections'):
-            self.active_connections: Dict[str, Set[WebSocket]] = {}
+        if not hasattr(self, 'topics'):
+            self.topics: Dict[str, Dict[WebSocket, Subscription]] = {}  # topic -> subscribers
+            self.connection_topics: Dict[WebSocket, Set[str]] = {}  # socket -> its topics
+            self.latest_states: Dict[str, Tuple[str, ExecutionState]] = {}  # topic -> (crew_id, state snapshot)
+            self.heartbeat_connections: Dict[WebSocket, float] = {}  # socket -> last time we heard from it
+            self.compressed_connections: Set[WebSocket] = set()  # sockets accepting compressed frames
+            self._reaper_task: Optional[asyncio.Task] = None
             self._connection_lock = asyncio.Lock()
 
-    async def connect(self, websocket: WebSocket, crew_id: str):
-        """Connect a new WebSocket client"""
+    @property
+    def connection_count(self) -> int:
+        return len(self.connection_topics)
+
+    def stats(self) -> Dict[str, Any]:
+        """Live connection figures, for monitoring leaks and sizing limits"""
+        return {
+            "connections": self.connection_count,
+            "heartbeat_connections": len(self.heartbeat_connections),
+            "subscriptions": sum(len(subscribers) for subscribers in self.topics.values()),
+            "topics": len(self.topics),
+            "pending_frames": sum(
+                subscription._pending is not None
+                for subscribers in self.topics.values()
+                for subscription in subscribers.values()
+            ),
+            "max_connections": settings.WS_MAX_CONNECTIONS,
+            "max_connections_per_crew": settings.WS_MAX_CONNECTIONS_PER_CREW,
+        }
+
+    async def accept(self, websocket: WebSocket, heartbeat: bool = False) -> bool:
+        """Accept a new WebSocket client without any subscription
+
+        Returns False (and rejects the handshake) when the process-wide
+        connection limit is reached.
+        """
+        if self.connection_count >= settings.WS_MAX_CONNECTIONS:
+            logger.warning(f"Rejecting WebSocket client: {self.connection_count} connections open")
+            await websocket.close(code=1013)  # Try again later
+            return False
+
         await websocket.accept()
         async with self._connection_lock:
-            if crew_id not in self.active_connections:
-                self.active_connections[crew_id] = set()
-            self.active_connections[crew_id].add(websocket)
-            logger.info(f"WebSocket client connected for crew {crew_id}")
+            self.connection_topics.setdefault(websocket, set())
+            if heartbeat:
+                self.heartbeat_connections[websocket] = time.monotonic()
+        return True
+
+    def touch(self, websocket: WebSocket):
+        """Record activity from a heartbeat client (any message, including pong)"""
+        if websocket in self.heartbeat_connections:
+            self.heartbeat_connections[websocket] = time.monotonic()
+
+    def enable_compression(self, websocket: WebSocket):
+        """Send this socket's large frames as zlib-compressed binary messages"""
+        self.compressed_connections.add(websocket)
+
+    def is_crew_full(self, websocket: WebSocket, topic: str) -> bool:
+        """Whether subscribing this socket would exceed the per-crew limit"""
+        if not topic.startswith("crew:"):
+            return False
+        subscribers = self.topics.get(topic, {})
+        return websocket not in subscribers and len(subscribers) >= settings.WS_MAX_CONNECTIONS_PER_CREW
 
-    async def disconnect(self, websocket: WebSocket, crew_id: str):
-        """Disconnect a WebSocket client"""
+    async def subscribe(
+        self,
+        websocket: WebSocket,
+        topic: str,
+        events: Optional[List[str]] = None,
+        verbosity: Verbosity = Verbosity.VERBOSE,
+        max_rate: Optional[float] = None
+    ) -> Subscription:
+        """Subscribe a connected client to a topic, replacing any previous filter"""
+        subscription = Subscription(
+            topic=topic,
+            events=set(events) if events else None,
+            verbosity=verbosity,
+            max_rate=max_rate
+        )
         async with self._connection_lock:
-            if crew_id in self.active_connections:
-                self.active_connections[crew_id].discard(websocket)
-                if not self.active_connections[crew_id]:
-                    del self.active_connections[crew_id]
-                logger.info(f"WebSocket client disconnected from crew {crew_id}")
-
-    async def broadcast_status(self, status_update: StatusUpdate, crew_id: str):
-        """Broadcast a status update to all connected clients for a specific crew"""
-        if crew_id not in self.active_connections:
+            previous = self.topics.setdefault(topic, {}).get(websocket)
+            if previous is not None:
+                self._cancel_pending(previous)
+            self.topics[topic][websocket] = subscription
+            self.connection_topics.setdefault(websocket, set()).add(topic)
+        logger.debug("WebSocket client subscribed to %s", topic)
+
+        # Bring the new subscriber up to date with the running execution
+        if topic in self.latest_states:
+            crew_id, state = self.latest_states[topic]
+            subscription._state_version = state.version
+            await self.send_direct_message(websocket, {
+                'type': 'state_snapshot',
+                'payload': {'crew_id': crew_id, 'topic': topic, 'state': state.model_dump(mode='json', warnings=False)}
+            })
+        return subscription
+
+    async def unsubscribe(self, websocket: WebSocket, topic: str):
+        """Remove a client's subscription to a topic"""
+        async with self._connection_lock:
+            self._remove_subscription(websocket, topic)
+            if websocket in self.connection_topics:
+                self.connection_topics[websocket].discard(topic)
+        logger.debug("WebSocket client unsubscribed from %s", topic)
+
+    def _remove_subscription(self, websocket: WebSocket, topic: str):
+        subscribers = self.topics.get(topic)
+        if subscribers is None:
             return
+        subscription = subscribers.pop(websocket, None)
+        if subscription is not None:
+            self._cancel_pending(subscription)
+        if not subscribers:
+            del self.topics[topic]
 
-        # Adapt message for frontend
-        message = adapt_message_for_frontend(status_update)
-        
-        # Get connections for this crew
-        connections = self.active_connections[crew_id].copy()
-        
-        # Send to all connected clients
-        for connection in connections:
-            try:
-                logger.info(f"Sending status update to crew {crew_id}: {message}")
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to client: {str(e)}")
-                # If sending fails, disconnect the client
-                await self.disconnect(connection, crew_id)
+    def _cancel_pending(self, subscription: Subscription):
+        subscription._pending = None
+        if subscription._flush_task is not None:
+            subscription._flush_task.cancel()
+            subscription._flush_task = None
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        crew_id: str,
+        events: Optional[List[str]] = None,
+        verbosity: Verbosity = Verbosity.VERBOSE,
+        max_rate: Optional[float] = None,
+        compression: Optional[str] = None
+    ):
+        """Connect a new WebSocket client to a single crew; returns False when rejected"""
+        topic = crew_topic(crew_id)
+        if self.is_crew_full(websocket, topic):
+            logger.warning(f"Rejecting WebSocket client: crew {crew_id} is at its connection limit")
+            await websocket.close(code=1013)
+            return False
+        if not await self.accept(websocket):
+            return False
+        if compression == "deflate":
+            self.enable_compression(websocket)
+        await self.subscribe(websocket, topic, events, verbosity, max_rate)
+        logger.info("WebSocket client connected for crew %s", crew_id)
+        return True
+
+    async def disconnect(self, websocket: WebSocket, crew_id: Optional[str] = None):
+        """Disconnect a WebSocket client and drop all of its subscriptions"""
+        async with self._connection_lock:
+            self.heartbeat_connections.pop(websocket, None)
+            self.compressed_connections.discard(websocket)
+            for topic in self.connection_topics.pop(websocket, set()):
+                self._remove_subscription(websocket, topic)
+        logger.info("WebSocket client disconnected")
+
+    def _collect_subscribers(self, topics: List[str], event: str) -> Dict[WebSocket, Subscription]:
+        """Subscribers of any of the topics whose filter accepts the event, one per socket"""
+        level = event_verbosity(event)
+        targets: Dict[WebSocket, Subscription] = {}
+        for topic in topics:
+            for websocket, subscription in list(self.topics.get(topic, {}).items()):
+                if websocket not in targets and subscription.accepts(event, level):
+                    targets[websocket] = subscription
+        return targets
+
+    def has_subscribers(self, crew_id: str, event: str, run_id: Optional[str] = None) -> bool:
+        """Whether anyone would receive this event; lets producers skip building it"""
+        level = event_verbosity(event)
+        topics = [crew_topic(crew_id)] + ([run_topic(run_id)] if run_id else [])
+        return any(
+            subscription.accepts(event, level)
+            for topic in topics
+            for subscription in list(self.topics.get(topic, {}).values())
+        )
+
+    async def broadcast_status(self, status_update: StatusUpdate, crew_id: str, run_id: Optional[str] = None):
+        """Broadcast a status update to every interested subscriber of the crew or run"""
+        event = event_name(status_update)
+        topics = [crew_topic(crew_id)]
+        if run_id:
+            topics.append(run_topic(run_id))
+        is_terminal = event in TERMINAL_EVENTS
+
+        state = getattr(status_update, 'execution_state', None)
+        if state is not None:
+            for topic in topics:
+                self.latest_states[topic] = (crew_id, state)
+        if is_terminal:
+            for topic in topics:
+                self.latest_states.pop(topic, None)
+
+        # Filter before encoding so uninteresting events cost nothing
+        targets = self._collect_subscribers(topics, event)
+        if not targets:
+            return
+
+        with websocket_broadcast_seconds.time():
+            # Adapt the message once; each state variant is encoded at most once
+            message = adapt_message_for_frontend(status_update)
+            message['payload'].update({'event': event, 'crew_id': crew_id, 'run_id': run_id})
+            frame = BroadcastFrame(message, state, getattr(status_update, 'state_delta', None))
+
+            await asyncio.gather(*(
+                self._deliver(websocket, subscription, frame, is_terminal)
+                for websocket, subscription in targets.items()
+            ))
+
+    async def _deliver(self, websocket: WebSocket, subscription: Subscription, frame: BroadcastFrame, is_terminal: bool):
+        """Send a frame now, or coalesce it when the subscriber's rate is exceeded"""
+        if subscription.max_rate is None or is_terminal:
+            self._cancel_pending(subscription)
+            await self._send(websocket, subscription, frame)
+            return
+
+        wait = subscription._last_sent + 1.0 / subscription.max_rate - time.monotonic()
+        if wait <= 0 and subscription._flush_task is None:
+            await self._send(websocket, subscription, frame)
+            return
+
+        # Keep only the latest frame; it goes out when the rate window reopens.
+        # Skipped deltas are harmless: the subscriber's state version no longer
+        # matches, so the flushed frame falls back to a snapshot.
+        subscription._pending = frame
+        if subscription._flush_task is None:
+            subscription._flush_task = asyncio.create_task(self._flush_later(websocket, subscription, max(wait, 0)))
+
+    async def _flush_later(self, websocket: WebSocket, subscription: Subscription, delay: float):
+        await asyncio.sleep(delay)
+        subscription._flush_task = None
+        frame, subscription._pending = subscription._pending, None
+        if frame is not None:
+            await self._send(websocket, subscription, frame)
+
+    async def _send(self, websocket: WebSocket, subscription: Subscription, frame: BroadcastFrame) -> bool:
+        variant = frame.variant_for(subscription)
+        try:
+            compressed = frame.compress(variant) if websocket in self.compressed_connections else None
+            if compressed is not None:
+                await websocket.send_bytes(compressed)
+            else:
+                await websocket.send_text(frame.encode(variant))
+            subscription._last_sent = time.monotonic()
+            websocket_frames_total.inc(variant=variant)
+            if frame.version is not None:
+                subscription._state_version = frame.version
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send message to client: {str(e)}")
+            # If sending fails, disconnect the client
+            await self.disconnect(websocket)
+            return False
 
     async def send_direct_message(self, websocket: WebSocket, message: Dict):
         """Send a message to a specific client"""
@@ -105,11 +418,57 @@ class WebSocketManager:
             await websocket.send_json(message)
         except Exception as e:
             logger.error(f"Failed to send direct message: {str(e)}")
-            # If sending fails, get crew_id and disconnect
-            for crew_id, connections in self.active_connections.items():
-                if websocket in connections:
-                    await self.disconnect(websocket, crew_id)
-                    break
+            await self.disconnect(websocket)
+
+    def start_reaper(self):
+        """Start the background heartbeat/idle-reaping loop (idempotent)"""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_forever())
+
+    async def stop_reaper(self):
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+
+    async def _reap_forever(self):
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_INTERVAL)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error(f"WebSocket reaper pass failed: {str(e)}")
+
+    async def reap(self):
+        """Close idle heartbeat clients and ping the rest"""
+        now = time.monotonic()
+        idle = [
+            websocket for websocket, last_seen in list(self.heartbeat_connections.items())
+            if now - last_seen > settings.WS_IDLE_TIMEOUT
+        ]
+        for websocket in idle:
+            logger.info("Closing idle WebSocket client")
+            try:
+                await websocket.close(code=1001)
+            except Exception:
+                pass  # Already closed or failed to close
+            await self.disconnect(websocket)
+
+        ping = json.dumps({'type': 'ping', 'payload': {'timestamp': datetime.utcnow().isoformat()}})
+        alive = list(self.heartbeat_connections)
+        results = await asyncio.gather(*(websocket.send_text(ping) for websocket in alive), return_exceptions=True)
+        for websocket, result in zip(alive, results):
+            if isinstance(result, Exception):
+                await self.disconnect(websocket)
 
 # Create a global instance
-ws_manager = WebSocketManager() 
\ No newline at end of file
+ws_manager = WebSocketManager()
+
+registry.gauge(
+    "websocket_connections", "Live WebSocket figures for this process",
+    lambda: {key: value for key, value in ws_manager.stats().items() if not key.startswith("max_")},
+    ["kind"]
+)
\ No newline at end of file
@@ -1,19 +1,23 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy_utils import database_exists, create_database
 from app.api.v1 import router as api_v1_router
 from app.database import engine, Base
+from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.tracing import setup_tracing, shutdown_tracing
 import logging
 from contextlib import asynccontextmanager
-from app.core.database import ensure_database_exists
+from app.core.database import ensure_database_exists, get_pool_stats, replica_engines
+from app.engine import load_runner
+from app.engine.websocket import ws_manager
+from app.core.health import db_health
 
 from app.middleware.cors import setup_cors
-from app.middleware.db_health import DatabaseHealthMiddleware
-from app.middleware.error_handler import error_handler_middleware, sqlalchemy_exception_handler, validation_exception_handler
-from app.middleware.logging import log_request_middleware
-from app.middleware.validation import request_validation_middleware
+from app.middleware.request import RequestMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.metrics import render_metrics
+from app.middleware.error_handler import sqlalchemy_exception_handler, validation_exception_handler
 from sqlalchemy.exc import SQLAlchemyError
 
 setup_logging()
@@ -21,17 +25,31 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Ensure database exists
-    await ensure_database_exists()
-    
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Schema changes belong to migrations; creating it here is only a development shortcut
+    if settings.DB_CREATE_SCHEMA:
+        await ensure_database_exists()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Execution workers import crewai now instead of during their first run
+    if settings.PRELOAD_EXECUTION_ENGINE:
+        load_runner()
+
+    # Probe the database in the background instead of on every request
+    await db_health.start()
+
+    # Ping WebSocket clients and reap idle ones
+    ws_manager.start_reaper()
     
     yield
     
     # Cleanup
+    await ws_manager.stop_reaper()
+    await db_health.stop()
     await engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+    shutdown_tracing()
 
 app = FastAPI(
     title="SpongeAgent Studio API",
@@ -40,16 +58,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-app.add_middleware(DatabaseHealthMiddleware)
-
-# Add middlewares
-app.middleware("http")(error_handler_middleware)
-app.middleware("http")(request_validation_middleware)
-app.middleware("http")(log_request_middleware)
+# Request IDs, path validation, database health gate, error mapping and timing in one layer
+app.add_middleware(RequestMiddleware)
 
 # Configure CORS
 setup_cors(app)
 
+# Optional OpenTelemetry spans (no-op unless TRACING_ENABLED)
+setup_tracing(app)
+
 # Exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
@@ -63,4 +80,22 @@ def read_root():
         "message": "Welcome to SpongeAgent Studio API",
         "version": "1.0.0",
         "docs_url": "/docs"
-    } 
\ No newline at end of file
+    }
+
+@app.get("/health")
+def health():
+    """Liveness probe with the cached database status"""
+    return {"status": "ok", "database": {**db_health.status(), "pool": get_pool_stats()}}
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 while the database circuit is open"""
+    database = db_health.status()
+    if not db_health.is_healthy:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": database})
+    return {"status": "ready", "database": database}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of execution, database, WebSocket and HTTP metrics"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -9,25 +9,6 @@ def setup_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-    )
-
-    @app.middleware("http")
-    async def cors_origin_middleware(request, call_next):
-        # Skip CORS check for OPTIONS requests
-        if request.method == "OPTIONS":
-            return await call_next(request)
-
-        # Skip CORS check for internal API routes
-        if request.url.path.startswith(f"{settings.API_V1_STR}/verify-access"):
-            return await call_next(request)
-
-        # Get origin from headers
-        origin = request.headers.get("origin")
-        if not origin:
-            return await call_next(request)
-
-        # Allow frontend URL
-        if origin == settings.FRONTEND_URL:
-            return await call_next(request)
-
-        return await call_next(request)
+        # Let the frontend read pagination cursors and cache validators
+        expose_headers=["ETag", "Last-Modified", "X-Next-Cursor", "X-Request-ID"],
+    )
\ No newline at end of file
@@ -0,0 +1,119 @@
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.health import db_health
+from app.core.metrics import http_request_seconds
+from app.core.query_stats import QueryStats, query_stats_var, check_query_stats
+from app.utils.error_formatter import get_formatted_traceback, format_error_message
+
+logger = logging.getLogger(__name__)
+
+# Set for the duration of each HTTP request, e.g. to tag log records
+request_id_var: ContextVar[str] = ContextVar("request_id", default="")
+
+# Paths outside the versioned API that are still served
+PUBLIC_PATHS = ("/", "/health", "/ready", "/metrics")
+PUBLIC_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/uploads")
+
+# Paths served even while the database is down
+DB_EXEMPT_PATHS = ("/health", "/ready", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+class RequestMiddleware:
+    """Single pure-ASGI layer for every HTTP request
+
+    In one pass it assigns a request ID, rejects paths outside the API, returns
+    503 while the cached database health is bad, turns unhandled exceptions into
+    JSON 500s and reports the processing time. With DB_QUERY_STATS it also
+    counts the request's SQL statements and checks them against the query
+    budget. WebSocket and lifespan scopes pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = Headers(scope=scope).get("x-request-id") or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+        # Nested in the stats of an enclosing count_queries block, if any; left alone when disabled
+        query_stats = QueryStats(parent=query_stats_var.get()) if settings.DB_QUERY_STATS else None
+        query_stats_token = query_stats_var.set(query_stats) if query_stats is not None else None
+        queries_checked = False
+        status_code = 500
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_started, queries_checked
+            if message["type"] == "http.response.start":
+                if query_stats is not None and not queries_checked:
+                    # Only once: in strict mode the 500 for an exceeded budget comes through here too
+                    queries_checked = True
+                    route = scope.get("route")
+                    check_query_stats(query_stats, scope["method"], getattr(route, "path", scope["path"]))
+                response_started = True
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = f"{time.perf_counter() - start_time:.3f}s"
+                if query_stats is not None:
+                    headers["X-DB-Queries"] = str(query_stats.count)
+                    headers["X-DB-Time"] = f"{query_stats.time:.3f}s"
+            await send(message)
+
+        try:
+            response = self._reject(scope["path"])
+            if response is not None:
+                await response(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            stack_frames = get_formatted_traceback()
+            logger.error(format_error_message(exc, stack_frames))
+            # Read per request, so toggling app.debug takes effect at once
+            if getattr(scope.get("app"), "debug", False):
+                message = {"error": str(exc), "type": exc.__class__.__name__, "stack_trace": stack_frames}
+            else:
+                message = "Internal server error"
+            await JSONResponse(status_code=500, content={"error": message})(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+            if query_stats_token is not None:
+                query_stats_var.reset(query_stats_token)
+            elapsed = time.perf_counter() - start_time
+            # Label by route template so path parameters don't explode cardinality
+            route = scope.get("route")
+            http_request_seconds.observe(
+                elapsed, method=scope["method"], route=getattr(route, "path", "unmatched"), status=str(status_code)
+            )
+            logger.debug(
+                "%s %s - %d in %.3fs", scope["method"], scope["path"], status_code, elapsed,
+                extra={"request_id": request_id}
+            )
+
+    def _reject(self, path: str):
+        """Response for requests that must not reach the app, or None"""
+        if not (
+            path.startswith(settings.API_V1_STR)
+            or path in PUBLIC_PATHS
+            or path.startswith(PUBLIC_PREFIXES)
+        ):
+            return JSONResponse(status_code=404, content={"error": "Invalid API version"})
+        if not db_health.is_healthy and path not in DB_EXEMPT_PATHS:
+            return Response(
+                content="Database connection error",
+                status_code=503,
+                headers={"Retry-After": str(int(settings.DB_HEALTH_RETRY_INTERVAL) or 1)}
+            )
+        return None
@@ -1,10 +1,12 @@
 from app.models.agent import Agent
 from app.models.crew import Crew, crew_agents
+from app.models.crew_run import CrewRun
 from app.models.task import Task
 
 __all__ = [
     "Agent",
     "Crew",
     "crew_agents",
+    "CrewRun",
     "Task"
 ] 
\ No newline at end of file
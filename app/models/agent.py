@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, ARRAY, JSON, func
+from sqlalchemy import Column, Index, String, Boolean, Integer, DateTime, ARRAY, JSON, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Agent(Base):
     __tablename__ = "agents"
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_agents_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
@@ -21,7 +25,7 @@ class Agent(Base):
     process_type = Column(String, nullable=False, server_default='sequential')
     custom_tools = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     crews = relationship("Crew", secondary="crew_agents", back_populates="agents")
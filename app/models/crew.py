@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Table, ForeignKey, func
+from sqlalchemy import Column, Index, String, Boolean, Integer, DateTime, Table, ForeignKey, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,11 +6,17 @@ from app.database import Base
 crew_agents = Table('crew_agents',
     Base.metadata,
     Column('crew_id', String, ForeignKey('crews.id'), primary_key=True),
-    Column('agent_id', String, ForeignKey('agents.id'), primary_key=True)
+    Column('agent_id', String, ForeignKey('agents.id'), primary_key=True),
+    # The primary key covers lookups by crew_id; this serves lookups by agent
+    Index('ix_crew_agents_agent_id', 'agent_id')
 )
 
 class Crew(Base):
     __tablename__ = "crews"
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_crews_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
@@ -20,7 +26,7 @@ class Crew(Base):
     verbose = Column(Boolean, server_default='true')
     max_rpm = Column(Integer, server_default='10')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     agents = relationship("Agent", secondary=crew_agents, back_populates="crews")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Index, String, Text, Float, DateTime, ForeignKey, JSON, func
+from sqlalchemy.orm import deferred
+from app.database import Base
+
+class CrewRun(Base):
+    """One execution of a crew; the primary key is the run ID sent to WebSocket clients"""
+    __tablename__ = "crew_runs"
+    __table_args__ = (
+        # Runs are listed per crew, newest first
+        Index("ix_crew_runs_crew_id_created_at", "crew_id", "created_at"),
+    )
+
+    id = Column(String, primary_key=True)
+    crew_id = Column(String, ForeignKey('crews.id', ondelete='CASCADE'), nullable=False)
+    status = Column(String, nullable=False, server_default='running')
+    inputs = Column(JSON)
+    error = Column(Text)
+    execution_time = Column(Float)
+    resource_usage = Column(JSON)
+    # Collapsed stacks from the sampling profiler; only loaded for download
+    profile = deferred(Column(Text))
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, ARRAY, func, Integer
+from sqlalchemy import Column, Index, String, Boolean, Text, DateTime, ForeignKey, ARRAY, func, Integer
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination order
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Tasks are looked up by their agent and by their crew
+        Index("ix_tasks_agent_id", "agent_id"),
+        Index("ix_tasks_crew_id", "crew_id"),
+    )
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
@@ -21,7 +28,7 @@ class Task(Base):
     max_iterations = Column(Integer, server_default='10')
     max_rpm = Column(Integer, server_default='10')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     agent = relationship("Agent", back_populates="tasks")
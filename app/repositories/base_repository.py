@@ -1,7 +1,9 @@
-from typing import TypeVar, Generic, Type, Optional, List
-from sqlalchemy import select
+from datetime import datetime
+from typing import TypeVar, Generic, Type, Optional, List, Any, Tuple
+from sqlalchemy import select, func, Column
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.base import Base
+from app.utils.pagination import paginate
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -29,6 +31,39 @@ class BaseRepository(Generic[ModelType]):
         )
         return list(result.scalars().all())
 
+    async def get_columns(
+        self,
+        columns: List[Column],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> List[Any]:
+        """Page through only the given columns as plain rows (no ORM objects or relationships)
+
+        ``created_at`` is always selected so the caller can build the next cursor.
+        """
+        selected = list(columns)
+        if self.model.created_at not in selected:
+            selected.append(self.model.created_at)
+        result = await self.db.execute(
+            paginate(select(*selected), self.model, limit, cursor, skip)
+        )
+        return list(result.all())
+
+    async def get_updated_at(self, id: str) -> Optional[datetime]:
+        """Last modification time of one row, or None if it does not exist"""
+        result = await self.db.execute(
+            select(self.model.updated_at).filter(self.model.id == id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Row count and latest updated_at; changes whenever a row is added, edited or removed"""
+        result = await self.db.execute(
+            select(func.count(self.model.id), func.max(self.model.updated_at))
+        )
+        return tuple(result.one())
+
     async def update(self, id: int, **kwargs) -> Optional[ModelType]:
         db_obj = await self.get(id)
         if db_obj is None:
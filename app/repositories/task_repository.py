@@ -0,0 +1,7 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.task import Task
+from app.repositories.base_repository import BaseRepository
+
+class TaskRepository(BaseRepository[Task]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Task, db)
@@ -1,17 +1,30 @@
-from app.schemas.agent import Agent, AgentCreate, AgentUpdate
+from app.schemas.agent import Agent, AgentCreate, AgentUpdate, AgentBulkCreate, AgentBulkUpdate
+from app.schemas.bulk import BulkResult, BulkDelete
 from app.schemas.crew import Crew, CrewCreate, CrewUpdate, ProcessType
-from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskStatus
+from app.schemas.crew_run import CrewRun
+from app.schemas.crew_document import CrewDocument, CrewDocumentAgent, CrewDocumentTask
+from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskStatus, TaskBulkCreate, TaskBulkUpdate
 
 __all__ = [
     "Agent",
     "AgentCreate",
     "AgentUpdate",
+    "AgentBulkCreate",
+    "AgentBulkUpdate",
+    "BulkResult",
+    "BulkDelete",
     "Crew",
     "CrewCreate",
     "CrewUpdate",
+    "CrewRun",
+    "CrewDocument",
+    "CrewDocumentAgent",
+    "CrewDocumentTask",
     "ProcessType",
     "Task",
     "TaskCreate",
     "TaskUpdate",
-    "TaskStatus"
+    "TaskStatus",
+    "TaskBulkCreate",
+    "TaskBulkUpdate"
 ] 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
+from app.schemas.bulk import MAX_BULK_ITEMS
 
 class AgentBase(BaseModel):
     name: str = Field(..., description="Name of the agent")
@@ -43,6 +44,16 @@ class AgentUpdate(AgentBase):
     process_type: Optional[str] = None
     custom_tools: Optional[List[str]] = None
 
+class AgentBulkCreate(BaseModel):
+    agents: List[AgentCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    crew_id: Optional[str] = Field(None, description="Crew to add all created agents to")
+
+class AgentBulkUpdateItem(AgentUpdate):
+    id: str
+
+class AgentBulkUpdate(BaseModel):
+    agents: List[AgentBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
 class Agent(AgentBase):
     id: str
     created_at: datetime
@@ -0,0 +1,10 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+MAX_BULK_ITEMS = 500
+
+class BulkResult(BaseModel):
+    ids: List[str] = Field(..., description="IDs of the affected rows, in request order for creates")
+
+class BulkDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS, description="IDs of the rows to delete")
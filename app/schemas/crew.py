@@ -3,6 +3,7 @@ from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
 from app.schemas.agent import Agent
+from app.schemas.bulk import MAX_BULK_ITEMS
 
 class ProcessType(str, Enum):
     SEQUENTIAL = "sequential"
@@ -34,6 +35,9 @@ class CrewUpdate(CrewBase):
     verbose: Optional[bool] = None
     max_rpm: Optional[int] = None
 
+class CrewAgentIds(BaseModel):
+    agent_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS, description="IDs of the agents to add or remove")
+
 class CrewNode(BaseModel):
     id: str
     position: dict
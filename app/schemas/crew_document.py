@@ -0,0 +1,65 @@
+from collections import Counter
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from app.schemas.crew import CrewBase
+
+CREW_DOCUMENT_VERSION = 1
+
+class CrewDocumentAgent(BaseModel):
+    """Agent as stored in a crew document; referenced by name instead of ID"""
+    name: str
+    role: str
+    goal: str
+    backstory: str
+    memory: bool = True
+    verbose: bool = True
+    allow_delegation: bool = False
+    tools: List[str] = Field(default_factory=list)
+    max_iterations: int = 5
+    max_rpm: int = 10
+    async_mode: bool = False
+    expertise_level: str = 'intermediate'
+    process_type: str = 'sequential'
+    custom_tools: Optional[List[str]] = None
+
+class CrewDocumentTask(BaseModel):
+    """Task as stored in a crew document; agent and dependencies are referenced by name"""
+    name: str
+    description: str
+    expected_output: str
+    agent_name: str
+    context: List[str] = Field(default_factory=list)
+    tools: List[str] = Field(default_factory=list)
+    dependencies: List[str] = Field(default_factory=list, description="Names of tasks this task depends on")
+    output_file: Optional[str] = None
+    async_mode: bool = False
+    max_iterations: int = 10
+    max_rpm: int = 10
+
+class CrewDocument(CrewBase):
+    """Portable, CrewConfig-shaped description of a whole crew
+
+    Database IDs are not part of the document, so it can be imported into any
+    environment. Tasks are listed in execution order.
+    """
+    version: int = CREW_DOCUMENT_VERSION
+    agents: List[CrewDocumentAgent] = Field(default_factory=list)
+    tasks: List[CrewDocumentTask] = Field(default_factory=list)
+
+    @model_validator(mode='after')
+    def check_references(self) -> 'CrewDocument':
+        agent_names = [agent.name for agent in self.agents]
+        task_names = [task.name for task in self.tasks]
+        for kind, names in (("agent", agent_names), ("task", task_names)):
+            duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+            if duplicates:
+                raise ValueError(f"Duplicate {kind} names: {', '.join(duplicates)}")
+
+        known_agents, known_tasks = set(agent_names), set(task_names)
+        for task in self.tasks:
+            if task.agent_name not in known_agents:
+                raise ValueError(f"Task '{task.name}' references unknown agent '{task.agent_name}'")
+            unknown = [name for name in task.dependencies if name not in known_tasks]
+            if unknown:
+                raise ValueError(f"Task '{task.name}' depends on unknown tasks: {', '.join(unknown)}")
+        return self
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+class CrewRun(BaseModel):
+    """A recorded crew execution and what it consumed"""
+    id: str
+    crew_id: str
+    status: str
+    inputs: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    execution_time: Optional[float] = None
+    resource_usage: Optional[Dict[str, Any]] = Field(
+        None,
+        description=(
+            "LLM calls, tokens and estimated cost per agent and task, tool time, kickoff thread CPU and DB time; "
+            "process CPU and peak RSS delta are worker-wide and include overlapping runs"
+        )
+    )
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
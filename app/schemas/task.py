@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
+from app.schemas.bulk import MAX_BULK_ITEMS
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -39,6 +40,15 @@ class TaskUpdate(TaskBase):
     max_rpm: Optional[int] = None
     status: Optional[TaskStatus] = None
 
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: str
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
 class Task(TaskBase):
     id: str
     status: TaskStatus = TaskStatus.PENDING
@@ -1,12 +1,16 @@
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, func
 from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.agent import Agent
-from app.schemas.agent import AgentCreate, AgentUpdate
+from app.models.crew import Crew, crew_agents
+from app.models.task import Task
+from app.schemas.agent import AgentCreate, AgentUpdate, AgentBulkUpdateItem
 import uuid
 from app.repositories.agent_repository import AgentRepository
+from app.utils.pagination import paginate
 
 class AgentService:
     def __init__(self, db: AsyncSession):
@@ -24,6 +28,39 @@ class AgentService:
             await self.db.rollback()
             raise ValueError(f"Failed to create agent: {str(e)}")
 
+    async def create_agents(self, agents: List[AgentCreate], crew_id: Optional[str] = None) -> List[str]:
+        """Insert a batch of agents (and optionally their crew memberships) in one transaction"""
+        ids = [str(uuid.uuid4()) for _ in agents]
+        # Distinct, increasing timestamps keep the request order for execution and pagination
+        start = datetime.now(timezone.utc)
+        try:
+            async with self.db.begin():
+                if crew_id is not None:
+                    # Bumping updated_at doubles as the existence check and invalidates the crew's ETag
+                    result = await self.db.execute(
+                        update(Crew).where(Crew.id == crew_id).values(updated_at=func.now())
+                    )
+                    if result.rowcount == 0:
+                        raise ValueError(f"Crew {crew_id} not found")
+
+                # A list of parameter sets is sent as multi-row INSERTs
+                await self.db.execute(
+                    insert(Agent),
+                    [
+                        {"id": id, "created_at": start + timedelta(microseconds=index), **agent.model_dump()}
+                        for index, (id, agent) in enumerate(zip(ids, agents))
+                    ]
+                )
+                if crew_id is not None:
+                    await self.db.execute(
+                        insert(crew_agents),
+                        [{"crew_id": crew_id, "agent_id": id} for id in ids]
+                    )
+            return ids
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to create agents: {str(e)}")
+
     async def get_agent(self, agent_id: str) -> Optional[Agent]:
         try:
             result = await self.db.execute(
@@ -35,15 +72,33 @@ class AgentService:
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to get agent: {str(e)}")
 
-    async def list_agents(self, skip: int = 0, limit: int = 100) -> List[Agent]:
+    async def list_agents(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Agent]:
         try:
             result = await self.db.execute(
-                select(Agent)
-                .options(joinedload(Agent.crews))
-                .offset(skip)
-                .limit(limit)
+                paginate(select(Agent), Agent, limit, cursor, skip)
             )
-            return result.unique().scalars().all()
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to list agents: {str(e)}")
+
+    async def get_agent_version(self, agent_id: str) -> Optional[datetime]:
+        """updated_at of the agent, used as its cache validator; None if it does not exist"""
+        try:
+            return await self.repository.get_updated_at(agent_id)
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get agent version: {str(e)}")
+
+    async def get_agents_version(self) -> Tuple[int, Optional[datetime]]:
+        """Count and latest updated_at of all agents, used as the list's cache validator"""
+        try:
+            return await self.repository.get_collection_version()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get agents version: {str(e)}")
+
+    async def list_agent_columns(self, columns: List[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        """List agents as rows of the given columns only"""
+        try:
+            return await self.repository.get_columns(columns, limit, cursor, skip)
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to list agents: {str(e)}")
 
@@ -82,6 +137,50 @@ class AgentService:
             await self.db.rollback()
             raise ValueError(f"Failed to delete agent: {str(e)}")
 
+    async def update_agents(self, agents: List[AgentBulkUpdateItem]) -> List[str]:
+        """Apply a batch of partial updates after loading all targets with one SELECT"""
+        ids = [agent.id for agent in agents]
+        try:
+            async with self.db.begin():
+                result = await self.db.execute(select(Agent).filter(Agent.id.in_(ids)))
+                db_agents = {db_agent.id: db_agent for db_agent in result.scalars()}
+                missing = [id for id in ids if id not in db_agents]
+                if missing:
+                    raise ValueError(f"Agents not found: {', '.join(missing)}")
+
+                for agent in agents:
+                    db_agent = db_agents[agent.id]
+                    for field, value in agent.model_dump(exclude_unset=True, exclude={"id"}).items():
+                        if field == "tools" and value is not None:
+                            value = [str(tool) for tool in value]
+                        setattr(db_agent, field, value)
+                await self.db.flush()
+            return ids
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to update agents: {str(e)}")
+
+    async def delete_agents(self, ids: List[str]) -> List[str]:
+        """Delete a batch of agents, detaching them from crews and tasks first; returns the deleted IDs"""
+        try:
+            async with self.db.begin():
+                await self.db.execute(
+                    update(Crew)
+                    .where(Crew.id.in_(select(crew_agents.c.crew_id).where(crew_agents.c.agent_id.in_(ids))))
+                    .values(updated_at=func.now())
+                )
+                await self.db.execute(delete(crew_agents).where(crew_agents.c.agent_id.in_(ids)))
+                await self.db.execute(
+                    update(Task).where(Task.agent_id.in_(ids)).values(agent_id=None)
+                )
+                result = await self.db.execute(
+                    delete(Agent).where(Agent.id.in_(ids)).returning(Agent.id)
+                )
+                return list(result.scalars())
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to delete agents: {str(e)}")
+
     async def list_agents_by_crew(self, crew_id: str) -> List[Agent]:
         """Get all agents for a specific crew"""
         result = await self.db.execute(
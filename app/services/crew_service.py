@@ -1,24 +1,48 @@
-from typing import List, Optional, Dict, Set, Any
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Dict, Set, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import joinedload
-from sqlalchemy.exc import SQLAlchemyError
-from app.models.crew import Crew
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.crew import Crew, crew_agents
 from app.models.agent import Agent
 from app.models.task import Task
+from app.models.crew_run import CrewRun
 from app.schemas.crew import CrewCreate, CrewUpdate
-from app.engine import CrewRunner, EngineConfig, WebSocketManager
+from app.schemas.crew_document import CrewDocument, CrewDocumentAgent, CrewDocumentTask
+from app.engine import EngineConfig, WebSocketManager, load_runner
 from app.engine.schemas import create_crew_config_from_json, StatusUpdate
 from app.services.tool_service import ToolService
 from app.repositories.crew_repository import CrewRepository
 from app.services.agent_service import AgentService
 from app.services.task_service import TaskService
 from app.engine.websocket import ws_manager
+from app.engine.resources import ResourceTracker
+from app.core.metrics import execution_phase_seconds
+from app.core.tracing import span, set_attributes
+from app.utils.pagination import paginate
+import time
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _unique_names(rows: Iterable[Any]) -> Dict[str, str]:
+    """Map row IDs to names, suffixing repeats so every name is distinct"""
+    rows = list(rows)
+    original = {row.name for row in rows}
+    used: Set[str] = set()
+    names = {}
+    for row in rows:
+        name, number = row.name, 1
+        while name in used or (name != row.name and name in original):
+            number += 1
+            name = f"{row.name} ({number})"
+        used.add(name)
+        names[row.id] = name
+    return names
+
 class CrewService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -87,111 +111,192 @@ class CrewService:
             ]
         }
 
-    async def execute_crew(self, crew_id: str, inputs: Optional[Dict[str, str]] = None) -> Dict:
+    async def execute_crew(self, crew_id: str, inputs: Optional[Dict[str, str]] = None, profile: bool = False) -> Dict:
         """
         Execute a crew using the CrewAI engine
         
         Args:
             crew_id: ID of the crew to execute
             inputs: Optional dictionary of input variables
+            profile: Sample the kickoff thread and store collapsed stacks with the run
             
         Returns:
             Dict containing execution results
         """
-        try:
-            # Get crew with all related data
-            crew = await self.get_crew(crew_id)
-            if not crew:
-                raise ValueError(f"Crew {crew_id} not found")
-
-            # Log crew details
-            logger.info(f"Executing crew: {crew.name} ({crew.id})")
-            logger.info(f"Process type: {crew.process_type}")
-            logger.info(f"Number of agents: {len(crew.agents)}")
-            logger.info(f"Inputs: {inputs}")
-
-            # Notify clients that execution has started
-            await ws_manager.broadcast_status(
-                StatusUpdate(
-                    status="started",
-                    message=f"Starting execution of crew {crew.name}",
-                    data={"crew_id": crew_id}
-                ),
-                crew_id
-            )
+        run_id = str(uuid.uuid4())
+        resources = ResourceTracker()
+        with span("crew_service.execute_crew", crew_id=crew_id, run_id=run_id) as execution_span:
+            try:
+                # Get crew with all related data
+                setup_start = time.perf_counter()
+                with span("db.load_crew", crew_id=crew_id):
+                    crew = await self.get_crew(crew_id)
+                if not crew:
+                    raise ValueError(f"Crew {crew_id} not found")
 
-            # Get all agents and their tasks for this crew
-            agents = crew.agents
-            logger.info(f"Agents loaded: {[f'{a.name} ({a.role})' for a in agents]}")
+                # Log crew details
+                logger.info("Executing crew %s (%s) with run %s", crew.name, crew.id, run_id)
+                logger.debug("Process type: %s, agents: %d, inputs: %s", crew.process_type, len(crew.agents), inputs)
 
-            # Get tasks through agent relationships
-            tasks = []
-            for agent in agents:
-                agent_tasks = await self.db.execute(
-                    select(Task).filter(Task.agent_id == agent.id)
+                # Notify clients that execution has started
+                await ws_manager.broadcast_status(
+                    StatusUpdate(
+                        status="started",
+                        message=f"Starting execution of crew {crew.name}",
+                        data={"crew_id": crew_id, "run_id": run_id}
+                    ),
+                    crew_id,
+                    run_id
                 )
-                agent_tasks = agent_tasks.scalars().all()
-                tasks.extend(agent_tasks)
-                logger.info(f"Agent {agent.name} has {len(agent_tasks)} tasks")
-                for task in agent_tasks:
-                    logger.info(f"Task: {task.name} (agent: {agent.name})")
-
-            # Convert database models to JSON configuration
-            json_config = self._convert_db_models_to_json(crew, agents, tasks)
+
+                # Get all agents and their tasks for this crew
+                agents = crew.agents
+                logger.debug("Loaded %d agents for crew %s", len(agents), crew_id)
+
+                # Get tasks through agent relationships, all agents in one query
+                with span("db.load_tasks", crew_id=crew_id, agent_count=len(agents)):
+                    agent_order = {agent.id: position for position, agent in enumerate(agents)}
+                    result = await self.db.execute(
+                        select(Task)
+                        .filter(Task.agent_id.in_(list(agent_order)))
+                        .order_by(Task.created_at, Task.id)
+                    )
+                    # Keep the tasks grouped in agent order, as the sequential process runs them in list order;
+                    # the sort is stable, so each agent's tasks stay in creation order
+                    tasks = sorted(result.scalars().all(), key=lambda task: agent_order[task.agent_id])
+                    logger.debug("Loaded %d tasks for %d agents", len(tasks), len(agents))
+
+                # Convert database models to JSON configuration
+                json_config = self._convert_db_models_to_json(crew, agents, tasks)
             
-            # Add inputs if provided
-            if inputs:
-                json_config["inputs"] = inputs
-
-            # Create crew configuration
-            crew_config = create_crew_config_from_json(json_config)
-
-            # Initialize runner with crew_id and tool service
-            runner = CrewRunner(
-                config=self.engine_config,
-                websocket_manager=ws_manager,
-                crew_id=crew_id,
-                tool_service=self.tool_service
+                # Add inputs if provided
+                if inputs:
+                    json_config["inputs"] = inputs
+
+                # Create crew configuration
+                crew_config = create_crew_config_from_json(json_config)
+
+                # Record the run; committing also ends the read transaction before the long kickoff
+                await self._start_run(run_id, crew_id, inputs)
+                resources.add_db_time("setup", time.perf_counter() - setup_start)
+
+                # Initialize runner with crew_id and tool service; the first run in this worker imports crewai
+                runner_class = load_runner()
+                runner = runner_class(
+                    config=self.engine_config,
+                    websocket_manager=ws_manager,
+                    crew_id=crew_id,
+                    tool_service=self.tool_service,
+                    run_id=run_id,
+                    resource_tracker=resources,
+                    profile=profile
+                )
+
+                # Execute crew
+                result = await runner.execute(crew_config)
+                set_attributes(execution_span, status=result.status, execution_time=result.execution_time)
+
+                # Update task statuses and outputs based on result
+                if result.status == "completed":
+                    write_back_start = time.perf_counter()
+                    with execution_phase_seconds.time(phase="write_back"), span("db.write_back", crew_id=crew_id, run_id=run_id):
+                        await self.task_service.update_task_outputs({
+                            task.id: result.output["tasks"][task.description]
+                            for task in tasks
+                            if task.description in result.output["tasks"]
+                        })
+                    resources.add_db_time("write_back", time.perf_counter() - write_back_start)
+                    result.resource_usage = resources.as_dict(result.execution_time)
+
+                await self._finish_run(
+                    run_id,
+                    status=result.status.value,
+                    error=result.error,
+                    execution_time=result.execution_time,
+                    resource_usage=result.resource_usage,
+                    profile=runner.profile_data
+                )
+
+                # Notify clients of completion
+                await ws_manager.broadcast_status(
+                    StatusUpdate(
+                        status="completed",
+                        message=f"Crew {crew.name} execution completed",
+                        data={"crew_id": crew_id, "run_id": run_id, "result": result.model_dump()}
+                    ),
+                    crew_id,
+                    run_id
+                )
+
+                return result.model_dump()
+
+            except Exception as e:
+                await self._finish_run(run_id, status="failed", error=str(e))
+                # Notify clients of error
+                await ws_manager.broadcast_status(
+                    StatusUpdate(
+                        status="error",
+                        message=str(e),
+                        data={"crew_id": crew_id, "run_id": run_id}
+                    ),
+                    crew_id,
+                    run_id
+                )
+                raise ValueError(f"Failed to execute crew: {str(e)}")
+
+    async def _start_run(self, run_id: str, crew_id: str, inputs: Optional[Dict[str, str]]) -> None:
+        try:
+            self.db.add(CrewRun(id=run_id, crew_id=crew_id, status="running", inputs=inputs or {}))
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to record crew run: {str(e)}")
+
+    async def _finish_run(self, run_id: str, status: str, **values: Any) -> None:
+        """Store the outcome of a run; never raises, so it cannot mask the execution's own error"""
+        try:
+            await self.db.rollback()
+            await self.db.execute(
+                update(CrewRun)
+                .where(CrewRun.id == run_id)
+                .values(status=status, finished_at=func.now(), **values)
             )
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error("Failed to record outcome of run %s: %s", run_id, e)
 
-            # Execute crew
-            result = await runner.execute(crew_config)
-
-            # Update task statuses and outputs based on result
-            if result.status == "completed":
-                for task in tasks:
-                    task_desc = task.description
-                    if task_desc in result.output["tasks"]:
-                        task_output = result.output["tasks"][task_desc]
-                        await self.update_task_output(
-                            task.id,
-                            output=task_output.get("output"),
-                            output_file=task_output.get("output_file")
-                        )
-
-            # Notify clients of completion
-            await ws_manager.broadcast_status(
-                StatusUpdate(
-                    status="completed",
-                    message=f"Crew {crew.name} execution completed",
-                    data={"crew_id": crew_id, "result": result.model_dump()}
-                ),
-                crew_id
+    async def get_run(self, crew_id: str, run_id: str) -> Optional[CrewRun]:
+        try:
+            result = await self.db.execute(
+                select(CrewRun).filter(CrewRun.id == run_id, CrewRun.crew_id == crew_id)
             )
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get crew run: {str(e)}")
 
-            return result.model_dump()
+    async def get_run_profile(self, crew_id: str, run_id: str) -> Optional[str]:
+        """Collapsed stacks recorded for a run, or None if the run was not profiled"""
+        try:
+            result = await self.db.execute(
+                select(CrewRun.profile).filter(CrewRun.id == run_id, CrewRun.crew_id == crew_id)
+            )
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get run profile: {str(e)}")
 
-        except Exception as e:
-            # Notify clients of error
-            await ws_manager.broadcast_status(
-                StatusUpdate(
-                    status="error",
-                    message=str(e),
-                    data={"crew_id": crew_id}
-                ),
-                crew_id
+    async def list_runs(self, crew_id: str, limit: int = 20) -> List[CrewRun]:
+        """Most recent runs of a crew first"""
+        try:
+            result = await self.db.execute(
+                select(CrewRun)
+                .filter(CrewRun.crew_id == crew_id)
+                .order_by(CrewRun.created_at.desc())
+                .limit(limit)
             )
-            raise ValueError(f"Failed to execute crew: {str(e)}")
+            return list(result.scalars())
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to list crew runs: {str(e)}")
 
     async def create_crew(self, crew: CrewCreate) -> Crew:
         try:
@@ -206,6 +311,107 @@ class CrewService:
             await self.db.rollback()
             raise ValueError(f"Failed to create crew: {str(e)}")
 
+    async def import_crew(self, document: CrewDocument) -> str:
+        """Create a crew with all its agents and tasks from a crew document in one transaction"""
+        crew_id = str(uuid.uuid4())
+        agent_ids = {agent.name: str(uuid.uuid4()) for agent in document.agents}
+        task_ids = {task.name: str(uuid.uuid4()) for task in document.tasks}
+        # Distinct, increasing timestamps preserve the document order for export and pagination
+        start = datetime.now(timezone.utc)
+        try:
+            async with self.db.begin():
+                await self.db.execute(
+                    insert(Crew).values(id=crew_id, **document.model_dump(mode='json', include=set(CrewCreate.model_fields)))
+                )
+                if document.agents:
+                    await self.db.execute(
+                        insert(Agent),
+                        [
+                            {"id": agent_ids[agent.name], "created_at": start + timedelta(microseconds=index), **agent.model_dump(mode='json')}
+                            for index, agent in enumerate(document.agents)
+                        ]
+                    )
+                    await self.db.execute(
+                        insert(crew_agents),
+                        [{"crew_id": crew_id, "agent_id": agent_id} for agent_id in agent_ids.values()]
+                    )
+                if document.tasks:
+                    await self.db.execute(
+                        insert(Task),
+                        [
+                            {
+                                **task.model_dump(mode='json', exclude={"agent_name", "dependencies"}),
+                                "id": task_ids[task.name],
+                                "crew_id": crew_id,
+                                "agent_id": agent_ids[task.agent_name],
+                                "dependencies": [task_ids[name] for name in task.dependencies],
+                                "created_at": start + timedelta(microseconds=index)
+                            }
+                            for index, task in enumerate(document.tasks)
+                        ]
+                    )
+            return crew_id
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to import crew: {str(e)}")
+
+    async def export_crew(self, crew_id: str) -> Optional[CrewDocument]:
+        """Build a crew document from a single streamed query over the crew, its agents and their tasks
+
+        The tasks are those execute_crew runs: every task assigned to a member agent.
+        Names that repeat in the database get a " (2)", " (3)" suffix, since the
+        document references agents and tasks by name.
+        """
+        stmt = (
+            select(Crew, Agent, Task)
+            .select_from(Crew)
+            .outerjoin(crew_agents, crew_agents.c.crew_id == Crew.id)
+            .outerjoin(Agent, Agent.id == crew_agents.c.agent_id)
+            .outerjoin(Task, Task.agent_id == Agent.id)
+            .filter(Crew.id == crew_id)
+            .order_by(Agent.created_at, Agent.id, Task.created_at, Task.id)
+        )
+        try:
+            db_crew, agents, tasks = None, {}, []
+            result = await self.db.stream(stmt)
+            async for crew_row, agent_row, task_row in result:
+                db_crew = crew_row
+                if agent_row is not None:
+                    agents.setdefault(agent_row.id, agent_row)
+                if task_row is not None:
+                    tasks.append(task_row)
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to export crew: {str(e)}")
+
+        if db_crew is None:
+            return None
+        tasks.sort(key=lambda task: (task.created_at, task.id))
+        agent_names = _unique_names(agents.values())
+        task_names = _unique_names(tasks)
+        return CrewDocument(
+            **{field: getattr(db_crew, field) for field in CrewCreate.model_fields},
+            agents=[
+                CrewDocumentAgent.model_validate(agent, from_attributes=True).model_copy(update={"name": agent_names[agent.id]})
+                for agent in agents.values()
+            ],
+            tasks=[
+                CrewDocumentTask(
+                    name=task_names[task.id],
+                    description=task.description,
+                    expected_output=task.expected_output,
+                    agent_name=agent_names[task.agent_id],
+                    context=task.context or [],
+                    tools=task.tools or [],
+                    dependencies=[task_names[id] for id in task.dependencies or [] if id in task_names],
+                    output_file=task.output_file,
+                    async_mode=task.async_mode,
+                    max_iterations=task.max_iterations,
+                    max_rpm=task.max_rpm
+                )
+                for task in tasks
+            ]
+        )
+
     async def get_crew(self, crew_id: str) -> Optional[Crew]:
         """Get a crew by ID with all related data"""
         try:
@@ -221,18 +427,7 @@ class CrewService:
             crew = result.unique().scalar_one_or_none()
             
             if crew:
-                logger.info(f"Loaded crew {crew_id} with {len(crew.agents)} agents and {len(crew.tasks)} tasks")
-                logger.info(f"Agents: {[f'{a.id}:{a.name}' for a in crew.agents]}")
-                
-                for task in crew.tasks:
-                    logger.info(
-                        f"Task details - ID: {task.id}, "
-                        f"Name: {task.name}, "
-                        f"Agent ID: {task.agent_id}, "
-                        f"Agent: {task.agent.name if task.agent else 'None'}, "
-                        f"Description: {task.description[:50]}..."
-                    )
-            
+                logger.debug("Loaded crew %s with %d agents and %d tasks", crew_id, len(crew.agents), len(crew.tasks))
             return crew
         except SQLAlchemyError as e:
             logger.error(f"Database error getting crew: {str(e)}")
@@ -241,21 +436,54 @@ class CrewService:
             logger.error(f"Error getting crew: {str(e)}")
             raise ValueError(f"Failed to get crew: {str(e)}")
 
-    async def list_crews(self, skip: int = 0, limit: int = 100) -> List[Crew]:
+    async def list_crews(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Crew]:
         try:
+            # selectinload keeps the page at `limit` rows instead of multiplying it by joins;
+            # tasks are not part of the Crew schema, so they are not loaded
             result = await self.db.execute(
-                select(Crew)
-                .options(
-                    joinedload(Crew.agents),
-                    joinedload(Crew.tasks)
-                )
-                .offset(skip)
-                .limit(limit)
+                paginate(select(Crew).options(selectinload(Crew.agents)), Crew, limit, cursor, skip)
             )
-            return result.unique().scalars().all()
+            return result.scalars().all()
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to list crews: {str(e)}")
 
+    async def list_crew_columns(self, columns: List[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        """List crews as rows of the given columns only"""
+        try:
+            return await self.repository.get_columns(columns, limit, cursor, skip)
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to list crews: {str(e)}")
+
+    async def get_crew_version(self, crew_id: str) -> Optional[Tuple[datetime, Optional[datetime], int]]:
+        """Cache validators for a crew: its updated_at plus the latest updated_at and count of its agents"""
+        try:
+            result = await self.db.execute(
+                select(Crew.updated_at, func.max(Agent.updated_at), func.count(Agent.id))
+                .select_from(Crew)
+                .outerjoin(Crew.agents)
+                .filter(Crew.id == crew_id)
+                .group_by(Crew.id)
+            )
+            row = result.one_or_none()
+            return tuple(row) if row else None
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get crew version: {str(e)}")
+
+    async def get_crews_version(self) -> Tuple[int, Optional[datetime], int, Optional[datetime]]:
+        """Cache validators for the crew list; agents are included because they are serialized with each crew"""
+        try:
+            result = await self.db.execute(
+                select(
+                    func.count(Crew.id),
+                    func.max(Crew.updated_at),
+                    select(func.count(Agent.id)).scalar_subquery(),
+                    select(func.max(Agent.updated_at)).scalar_subquery()
+                )
+            )
+            return tuple(result.one())
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get crews version: {str(e)}")
+
     async def update_crew(self, crew_id: str, crew: CrewUpdate) -> Optional[Crew]:
         try:
             async with self.db.begin():
@@ -289,72 +517,101 @@ class CrewService:
             raise ValueError(f"Failed to update crew: {str(e)}")
 
     async def delete_crew(self, crew_id: str) -> bool:
+        """Delete a crew, detaching its agents and tasks, without loading it first"""
         try:
             async with self.db.begin():
-                db_crew = await self.get_crew(crew_id)
-                if not db_crew:
-                    return False
-
-                await self.db.delete(db_crew)
-                return True
+                await self.db.execute(delete(crew_agents).where(crew_agents.c.crew_id == crew_id))
+                await self.db.execute(update(Task).where(Task.crew_id == crew_id).values(crew_id=None))
+                result = await self.db.execute(delete(Crew).where(Crew.id == crew_id).returning(Crew.id))
+                return result.scalar_one_or_none() is not None
         except SQLAlchemyError as e:
             await self.db.rollback()
             raise ValueError(f"Failed to delete crew: {str(e)}")
 
-    async def add_agent_to_crew(self, crew_id: str, agent_id: str) -> Optional[Crew]:
+    async def add_agents_to_crew(self, crew_id: str, agent_ids: List[str]) -> Optional[List[str]]:
+        """Add agents to a crew with one idempotent INSERT
+
+        Returns the IDs that were not members yet, or None if the crew or any agent does not exist.
+        """
         try:
             async with self.db.begin():
-                db_crew = await self.get_crew(crew_id)
                 result = await self.db.execute(
-                    select(Agent).filter(Agent.id == agent_id)
+                    pg_insert(crew_agents)
+                    .values([{"crew_id": crew_id, "agent_id": agent_id} for agent_id in agent_ids])
+                    .on_conflict_do_nothing()
+                    .returning(crew_agents.c.agent_id)
                 )
-                db_agent = result.scalar_one_or_none()
-
-                if not db_crew or not db_agent:
-                    return None
-
-                if db_agent not in db_crew.agents:
-                    db_crew.agents.append(db_agent)
-                    await self.db.flush()
-                
-                return db_crew
+                added = list(result.scalars())
+                if added:
+                    await self._touch_crew(crew_id)
+                return added
+        except IntegrityError:
+            # Foreign key violation: unknown crew or agent
+            return None
         except SQLAlchemyError as e:
             await self.db.rollback()
-            raise ValueError(f"Failed to add agent to crew: {str(e)}")
+            raise ValueError(f"Failed to add agents to crew: {str(e)}")
 
-    async def remove_agent_from_crew(self, crew_id: str, agent_id: str) -> Optional[Crew]:
+    async def remove_agents_from_crew(self, crew_id: str, agent_ids: List[str]) -> List[str]:
+        """Remove agents from a crew with one DELETE; returns the IDs that were members"""
         try:
             async with self.db.begin():
-                db_crew = await self.get_crew(crew_id)
                 result = await self.db.execute(
-                    select(Agent).filter(Agent.id == agent_id)
+                    delete(crew_agents)
+                    .where(crew_agents.c.crew_id == crew_id, crew_agents.c.agent_id.in_(agent_ids))
+                    .returning(crew_agents.c.agent_id)
                 )
-                db_agent = result.scalar_one_or_none()
+                removed = list(result.scalars())
+                if removed:
+                    await self._touch_crew(crew_id)
+                return removed
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to remove agents from crew: {str(e)}")
 
-                if not db_crew or not db_agent:
-                    return None
+    async def add_agent_to_crew(self, crew_id: str, agent_id: str) -> Optional[Crew]:
+        if await self.add_agents_to_crew(crew_id, [agent_id]) is None:
+            return None
+        return await self._get_crew_with_agents(crew_id)
 
-                if db_agent in db_crew.agents:
-                    db_crew.agents.remove(db_agent)
-                    await self.db.flush()
-                
-                return db_crew
+    async def remove_agent_from_crew(self, crew_id: str, agent_id: str) -> Optional[Crew]:
+        """Remove one agent; None if the crew or the agent does not exist"""
+        if not await self.remove_agents_from_crew(crew_id, [agent_id]):
+            # Nothing removed: only an existing agent that was not a member is a no-op
+            try:
+                result = await self.db.execute(select(Agent.id).filter(Agent.id == agent_id))
+            except SQLAlchemyError as e:
+                raise ValueError(f"Failed to remove agent from crew: {str(e)}")
+            if result.scalar_one_or_none() is None:
+                return None
+        return await self._get_crew_with_agents(crew_id)
+
+    async def _touch_crew(self, crew_id: str) -> None:
+        # Membership lives in crew_agents; bump the crew so its ETag changes
+        await self.db.execute(update(Crew).where(Crew.id == crew_id).values(updated_at=func.now()))
+
+    async def _get_crew_with_agents(self, crew_id: str) -> Optional[Crew]:
+        """Load only what the Crew schema serializes"""
+        try:
+            result = await self.db.execute(
+                select(Crew).options(selectinload(Crew.agents)).filter(Crew.id == crew_id)
+            )
+            return result.scalar_one_or_none()
         except SQLAlchemyError as e:
-            await self.db.rollback()
-            raise ValueError(f"Failed to remove agent from crew: {str(e)}") 
+            raise ValueError(f"Failed to get crew: {str(e)}")
 
     async def get_crew_variables(self, crew_id: str) -> Set[str]:
         """Get all required variables for a crew's execution"""
         # Get the crew and its associated agents and tasks
         crew = await self.repository.get(crew_id)
-        logger.info(f"get_crew_variables Crew: {crew}")
+        logger.debug("get_crew_variables Crew: %s", crew)
         if not crew:
             return set()
             
         agents = await self.agent_service.list_agents_by_crew(crew_id)
         tasks = await self.task_service.list_tasks_by_crew(crew_id)
-        logger.info(f"get_crew_variables Agents: {agents}")
-        logger.info(f"get_crew_variables Tasks: {tasks}")
+        logger.debug("get_crew_variables Agents: %s", agents)
+        logger.debug("get_crew_variables Tasks: %s", tasks)
         
         # Validate that crew has both agents and tasks
         if not agents or not tasks:
@@ -364,6 +621,7 @@ class CrewService:
         # Convert to JSON format and create crew config
         json_config = self._convert_db_models_to_json(crew, agents, tasks)
         crew_config = create_crew_config_from_json(json_config)
-        logger.info(f"get_crew_variables Crew config: {crew_config.model_dump_json(indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("get_crew_variables Crew config: %s", crew_config.model_dump_json(indent=2))
         
         return crew_config.get_required_variables() 
\ No newline at end of file
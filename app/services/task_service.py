@@ -1,17 +1,21 @@
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete
 from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.task import Task
 from app.models.agent import Agent
 from app.models.crew import Crew
-from app.schemas.task import TaskCreate, TaskUpdate, TaskStatus
+from app.schemas.task import TaskCreate, TaskUpdate, TaskStatus, TaskBulkUpdateItem
+from app.utils.pagination import paginate
+from app.repositories.task_repository import TaskRepository
 import uuid
 
 class TaskService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.repository = TaskRepository(db)
 
     async def create_task(self, task: TaskCreate) -> Task:
         try:
@@ -24,6 +28,30 @@ class TaskService:
             await self.db.rollback()
             raise ValueError(f"Failed to create task: {str(e)}")
 
+    async def create_tasks(self, tasks: List[TaskCreate]) -> List[str]:
+        """Insert a batch of tasks with multi-row INSERTs in one transaction"""
+        ids = [str(uuid.uuid4()) for _ in tasks]
+        # Distinct, increasing timestamps keep the request order for execution and pagination
+        start = datetime.now(timezone.utc)
+        try:
+            async with self.db.begin():
+                await self.db.execute(
+                    insert(Task),
+                    [
+                        {
+                            "id": id,
+                            "status": TaskStatus.PENDING.value,
+                            "created_at": start + timedelta(microseconds=index),
+                            **task.model_dump()
+                        }
+                        for index, (id, task) in enumerate(zip(ids, tasks))
+                    ]
+                )
+            return ids
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to create tasks: {str(e)}")
+
     async def get_task(self, task_id: str) -> Optional[Task]:
         try:
             result = await self.db.execute(
@@ -35,37 +63,50 @@ class TaskService:
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to get task: {str(e)}")
 
-    async def list_tasks(self, skip: int = 0, limit: int = 100) -> List[Task]:
+    async def list_tasks(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Task]:
         try:
-            result = await self.db.execute(
-                select(Task)
-                .options(joinedload(Task.agent), joinedload(Task.crew))
-                .offset(skip)
-                .limit(limit)
-            )
-            return result.unique().scalars().all()
+            # The Task schema only exposes agent_id/crew_id, so relationships are not loaded
+            result = await self.db.execute(paginate(select(Task), Task, limit, cursor, skip))
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to list tasks: {str(e)}")
+
+    async def get_task_version(self, task_id: str) -> Optional[datetime]:
+        """updated_at of the task, used as its cache validator; None if it does not exist"""
+        try:
+            return await self.repository.get_updated_at(task_id)
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get task version: {str(e)}")
+
+    async def get_tasks_version(self) -> Tuple[int, Optional[datetime]]:
+        """Count and latest updated_at of all tasks, used as the list's cache validator"""
+        try:
+            return await self.repository.get_collection_version()
+        except SQLAlchemyError as e:
+            raise ValueError(f"Failed to get tasks version: {str(e)}")
+
+    async def list_task_columns(self, columns: List[Any], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Any]:
+        """List tasks as rows of the given columns only"""
+        try:
+            return await self.repository.get_columns(columns, limit, cursor, skip)
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to list tasks: {str(e)}")
 
     async def get_tasks_by_agent(self, agent_id: str) -> List[Task]:
         try:
             result = await self.db.execute(
-                select(Task)
-                .options(joinedload(Task.agent), joinedload(Task.crew))
-                .filter(Task.agent_id == agent_id)
+                select(Task).filter(Task.agent_id == agent_id)
             )
-            return result.unique().scalars().all()
+            return result.scalars().all()
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to get tasks by agent: {str(e)}")
 
     async def get_tasks_by_crew(self, crew_id: str) -> List[Task]:
         try:
             result = await self.db.execute(
-                select(Task)
-                .options(joinedload(Task.agent), joinedload(Task.crew))
-                .filter(Task.crew_id == crew_id)
+                select(Task).filter(Task.crew_id == crew_id)
             )
-            return result.unique().scalars().all()
+            return result.scalars().all()
         except SQLAlchemyError as e:
             raise ValueError(f"Failed to get tasks by crew: {str(e)}")
 
@@ -100,6 +141,39 @@ class TaskService:
             await self.db.rollback()
             raise ValueError(f"Failed to delete task: {str(e)}")
 
+    async def update_tasks(self, tasks: List[TaskBulkUpdateItem]) -> List[str]:
+        """Apply a batch of partial updates after loading all targets with one SELECT"""
+        ids = [task.id for task in tasks]
+        try:
+            async with self.db.begin():
+                result = await self.db.execute(select(Task).filter(Task.id.in_(ids)))
+                db_tasks = {db_task.id: db_task for db_task in result.scalars()}
+                missing = [id for id in ids if id not in db_tasks]
+                if missing:
+                    raise ValueError(f"Tasks not found: {', '.join(missing)}")
+
+                for task in tasks:
+                    db_task = db_tasks[task.id]
+                    for field, value in task.model_dump(exclude_unset=True, exclude={"id"}).items():
+                        setattr(db_task, field, value)
+                await self.db.flush()
+            return ids
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to update tasks: {str(e)}")
+
+    async def delete_tasks(self, ids: List[str]) -> List[str]:
+        """Delete a batch of tasks with one statement; returns the deleted IDs"""
+        try:
+            async with self.db.begin():
+                result = await self.db.execute(
+                    delete(Task).where(Task.id.in_(ids)).returning(Task.id)
+                )
+                return list(result.scalars())
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to delete tasks: {str(e)}")
+
     async def update_task_status(self, task_id: str, status: TaskStatus) -> Optional[Task]:
         try:
             async with self.db.begin():
@@ -137,6 +211,30 @@ class TaskService:
             await self.db.rollback()
             raise ValueError(f"Failed to update task output: {str(e)}")
 
+    async def update_task_outputs(self, outputs: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Store execution outputs for a batch of tasks with one SELECT and one batched UPDATE
+
+        ``outputs`` maps task IDs to ``{"output": ..., "output_file": ...}``; returns the updated IDs.
+        """
+        if not outputs:
+            return []
+        try:
+            async with self.db.begin():
+                result = await self.db.execute(select(Task).filter(Task.id.in_(list(outputs))))
+                updated = []
+                for db_task in result.scalars():
+                    task_output = outputs[db_task.id]
+                    db_task.output = task_output.get("output")
+                    if task_output.get("output_file"):
+                        db_task.output_file = task_output["output_file"]
+                    db_task.status = TaskStatus.COMPLETED
+                    updated.append(db_task.id)
+                await self.db.flush()
+            return updated
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise ValueError(f"Failed to update task outputs: {str(e)}")
+
     async def list_tasks_by_crew(self, crew_id: str) -> List[Task]:
         """Get all tasks for a specific crew through its agents"""
         result = await self.db.execute(
@@ -1,53 +1,8 @@
-from typing import List, Dict, Type
+from typing import TYPE_CHECKING, List, Dict, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
-from crewai_tools import (
-    BrowserbaseLoadTool,
-    CodeDocsSearchTool,
-    CodeInterpreterTool,
-    ComposioTool,
-    CSVSearchTool,
-    DallETool,
-    DirectorySearchTool,
-    DirectoryReadTool,
-    DOCXSearchTool,
-    EXASearchTool,
-    FileReadTool,
-    FirecrawlSearchTool,
-    FirecrawlCrawlWebsiteTool,
-    FirecrawlScrapeWebsiteTool,
-    GithubSearchTool,
-    SerperDevTool,
-    TXTSearchTool,
-    JSONSearchTool,
-    MDXSearchTool,
-    PDFSearchTool,
-    PGSearchTool,
-    VisionTool,
-    RagTool,
-    ScrapeElementFromWebsiteTool,
-    ScrapeWebsiteTool,
-    WebsiteSearchTool,
-    XMLSearchTool,
-    YoutubeChannelSearchTool,
-    YoutubeVideoSearchTool
-)
-from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
-
-class CustomToolInput(BaseModel):
-    """Input schema for custom tools."""
-    query: str = Field(..., description="The input query for the tool")
-
-class CustomTool(BaseTool):
-    """Template for creating custom tools."""
-    name: str = "custom_tool_template"
-    description: str = "Template for creating custom tools"
-    args_schema: Type[BaseModel] = CustomToolInput
 
-    def _run(self, query: str) -> str:
-        """Execute the tool's logic."""
-        # Implement your custom tool logic here
-        return f"Processed query: {query}"
+if TYPE_CHECKING:
+    from crewai.tools import BaseTool
 
 class ToolService:
     def __init__(self, db: AsyncSession):
@@ -213,50 +168,55 @@ class ToolService:
             }
         }
         
+        # crewai_tools class names, imported on first use so API workers don't load the LLM stack
         self._tool_implementations = {
-            "browserbase_load": BrowserbaseLoadTool,
-            "code_docs_search": CodeDocsSearchTool,
-            "code_interpreter": CodeInterpreterTool,
-            "composio": ComposioTool,
-            "csv_search": CSVSearchTool,
-            "dalle": DallETool,
-            "directory_search": DirectorySearchTool,
-            "directory_read": DirectoryReadTool,
-            "docx_search": DOCXSearchTool,
-            "exa_search": EXASearchTool,
-            "file_read": FileReadTool,
-            "firecrawl_search": FirecrawlSearchTool,
-            "firecrawl_crawl": FirecrawlCrawlWebsiteTool,
-            "firecrawl_scrape": FirecrawlScrapeWebsiteTool,
-            "github_search": GithubSearchTool,
-            "serper_dev": SerperDevTool,
-            "txt_search": TXTSearchTool,
-            "json_search": JSONSearchTool,
-            "mdx_search": MDXSearchTool,
-            "pdf_search": PDFSearchTool,
-            "pg_search": PGSearchTool,
-            "vision": VisionTool,
-            "rag": RagTool,
-            "scrape_element": ScrapeElementFromWebsiteTool,
-            "scrape_website": ScrapeWebsiteTool,
-            "website_search": WebsiteSearchTool,
-            "xml_search": XMLSearchTool,
-            "youtube_channel_search": YoutubeChannelSearchTool,
-            "youtube_video_search": YoutubeVideoSearchTool
+            "browserbase_load": "BrowserbaseLoadTool",
+            "code_docs_search": "CodeDocsSearchTool",
+            "code_interpreter": "CodeInterpreterTool",
+            "composio": "ComposioTool",
+            "csv_search": "CSVSearchTool",
+            "dalle": "DallETool",
+            "directory_search": "DirectorySearchTool",
+            "directory_read": "DirectoryReadTool",
+            "docx_search": "DOCXSearchTool",
+            "exa_search": "EXASearchTool",
+            "file_read": "FileReadTool",
+            "firecrawl_search": "FirecrawlSearchTool",
+            "firecrawl_crawl": "FirecrawlCrawlWebsiteTool",
+            "firecrawl_scrape": "FirecrawlScrapeWebsiteTool",
+            "github_search": "GithubSearchTool",
+            "serper_dev": "SerperDevTool",
+            "txt_search": "TXTSearchTool",
+            "json_search": "JSONSearchTool",
+            "mdx_search": "MDXSearchTool",
+            "pdf_search": "PDFSearchTool",
+            "pg_search": "PGSearchTool",
+            "vision": "VisionTool",
+            "rag": "RagTool",
+            "scrape_element": "ScrapeElementFromWebsiteTool",
+            "scrape_website": "ScrapeWebsiteTool",
+            "website_search": "WebsiteSearchTool",
+            "xml_search": "XMLSearchTool",
+            "youtube_channel_search": "YoutubeChannelSearchTool",
+            "youtube_video_search": "YoutubeVideoSearchTool"
         }
         
         self._custom_tools: Dict[str, Dict[str, str]] = {}
-        self._custom_tool_implementations: Dict[str, Type[BaseTool]] = {}
+        self._custom_tool_implementations: Dict[str, Type["BaseTool"]] = {}
 
     async def list_tools(self) -> List[Dict[str, str]]:
         """List all available tools."""
         return list(self._built_in_tools.values()) + list(self._custom_tools.values())
 
-    def get_tool_implementation(self, name: str) -> Type[BaseTool]:
+    def get_tool_implementation(self, name: str) -> Optional[Type["BaseTool"]]:
         """Get a tool implementation by name."""
-        return self._tool_implementations.get(name) or self._custom_tool_implementations.get(name)
+        class_name = self._tool_implementations.get(name)
+        if class_name is not None:
+            import crewai_tools
+            return getattr(crewai_tools, class_name)
+        return self._custom_tool_implementations.get(name)
 
-    async def register_custom_tool(self, name: str, description: str, tool_class: Type[BaseTool]) -> None:
+    async def register_custom_tool(self, name: str, description: str, tool_class: Type["BaseTool"]) -> None:
         """Register a new custom tool."""
         self._custom_tools[name] = {
             "name": name,
@@ -265,7 +225,7 @@ class ToolService:
         }
         self._custom_tool_implementations[name] = tool_class
 
-# Example of creating and registering a custom tool:
+# Example of creating and registering a custom tool (input schema as in app/tools/custom_tool_template.py):
 """
 class MyCustomTool(BaseTool):
     name: str = "my_custom_tool"
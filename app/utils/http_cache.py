@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+import hashlib
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the values that determine a representation"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against current validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" and "x" match
+        current = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+def set_cache_headers(
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = "no-cache"
+) -> None:
+    """Attach validators; ``no-cache`` lets clients store the response but revalidate every use"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None, cache_control: str = "no-cache") -> Response:
+    """Empty 304 response carrying the same validators as a full one"""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified, cache_control)
+    return response
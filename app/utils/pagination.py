@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+from fastapi import Response
+from sqlalchemy import Select, tuple_
+import base64
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Opaque cursor pointing just after the row with this (created_at, id)"""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def paginate(stmt: Select, model: Any, limit: int, cursor: Optional[str] = None, skip: int = 0) -> Select:
+    """Order by (created_at, id) and page with a keyset cursor
+
+    ``skip`` is only honoured without a cursor, for clients still using offsets.
+    The row comparison is served by the model's (created_at, id) index, so
+    every page costs the same regardless of depth.
+    """
+    stmt = stmt.order_by(model.created_at, model.id).limit(limit)
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        return stmt.where(tuple_(model.created_at, model.id) > tuple_(created_at, id))
+    if skip:
+        stmt = stmt.offset(skip)
+    return stmt
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int):
+    """Expose the cursor of the next page when this page is full"""
+    if limit and len(items) >= limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
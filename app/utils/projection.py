@@ -0,0 +1,42 @@
+from typing import Any, List, Optional, Sequence
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Column
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+def resolve_columns(
+    model: Any,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    summary_fields: Sequence[str] = ("id", "name")
+) -> Optional[List[Column]]:
+    """Translate ``fields=``/``view=`` query parameters into table columns
+
+    Returns None when the full representation is requested. Only scalar
+    columns can be selected; ``id`` is always included. Raises ValueError
+    for unknown views or fields.
+    """
+    if view not in (None, "full", "summary"):
+        raise ValueError(f"Unknown view '{view}', expected 'full' or 'summary'")
+    if not fields and view != "summary":
+        return None
+
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(summary_fields)
+    table_columns = model.__table__.columns
+    unknown = [name for name in names if name not in table_columns]
+    if unknown:
+        raise ValueError(f"Unknown fields for {model.__tablename__}: {', '.join(unknown)}")
+
+    if "id" not in names:
+        names.insert(0, "id")
+    return [table_columns[name] for name in dict.fromkeys(names)]
+
+def projection_response(rows: Sequence[Any], columns: List[Column], limit: int) -> JSONResponse:
+    """Serialize projected rows directly, skipping ORM hydration and response models"""
+    names = [column.name for column in columns]
+    headers = {}
+    if limit and len(rows) >= limit:
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    content = [{name: getattr(row, name) for name in names} for row in rows]
+    return JSONResponse(content=jsonable_encoder(content), headers=headers)
@@ -0,0 +1,346 @@
+"""Offline benchmark of the execution engine with a fake LLM and fake tools.
+
+Runs entirely in-process: crews are executed by CrewRunner against the
+deterministic server in scripts/fake_llm.py, WebSocket clients are in-memory
+fakes and no database is needed. Measured:
+
+- callbacks: cost of a CrewCallbackHandler event with no subscribers
+- broadcast: latency from a callback to delivery at N subscribed clients
+- setup: CrewRunner agent/task/crew creation time for the configured crew size
+- execution: end-to-end run time and LLM calls per run
+- memory: peak Python allocations per run with several runs in flight
+
+Results are written as JSON. With --baseline, each timing is compared to a
+previous result file and the script exits 1 when one regressed by more than
+--tolerance, so it can gate a deploy.
+
+    python scripts/bench_engine.py [--agents 4] [--tasks 8] [--tools 2] [--fan-out 2]
+        [--clients 100] [--events 2000] [--runs 5] [--concurrency 4]
+        [--output bench_engine.json] [--baseline previous.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Type
+
+from pydantic import BaseModel, Field
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_llm import FakeLLMServer, use_fake_llm
+
+# The OpenAI clients read these when crewai is imported
+llm_server = FakeLLMServer()
+use_fake_llm(llm_server.start())
+
+from crewai.tools import BaseTool
+from app.core.metrics import execution_phase_seconds
+from app.engine import CrewRunner, EngineConfig, WebSocketManager
+from app.engine.callbacks import CrewCallbackHandler
+from app.engine.schemas import CrewConfig, AgentConfig, TaskConfig
+from app.engine.websocket import crew_topic
+from app.services.tool_service import ToolService
+
+CREW_ID = "bench-crew"
+RUN_ID = "bench-run"
+SETUP_PHASES = ("create_agents", "create_tasks", "create_crew")
+
+# Timings where a larger value is a regression; everything else is informational
+COMPARED = {
+    "callbacks": ("no_subscribers_us",),
+    "broadcast": ("p50_ms", "p95_ms"),
+    "setup": ("total_ms",),
+    "execution": ("p50_s",),
+    "memory": ("peak_bytes_per_run",),
+}
+
+class FakeWebSocket:
+    """Just enough of starlette's WebSocket for WebSocketManager"""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames += 1
+        self.bytes += len(data)
+
+    async def send_bytes(self, data: bytes):
+        self.frames += 1
+        self.bytes += len(data)
+
+    async def send_json(self, data):
+        await self.send_text(json.dumps(data))
+
+class BenchToolInput(BaseModel):
+    query: str = Field(..., description="Query for the benchmark tool")
+
+def make_tool(tool_name: str, latency: float) -> Type[BaseTool]:
+    class BenchTool(BaseTool):
+        name: str = tool_name
+        description: str = f"Benchmark tool {tool_name}; returns a canned result"
+        args_schema: Type[BaseModel] = BenchToolInput
+
+        def _run(self, query: str) -> str:
+            if latency:
+                time.sleep(latency)
+            return f"{tool_name} result for {query}"
+
+    return BenchTool
+
+async def make_tool_service(tools: int, latency: float) -> ToolService:
+    service = ToolService(None)
+    for i in range(tools):
+        name = f"bench_tool_{i}"
+        await service.register_custom_tool(name, f"Benchmark tool {i}", make_tool(name, latency))
+    return service
+
+def make_crew_config(agents: int, tasks: int, tools: int, fan_out: int) -> CrewConfig:
+    """Crew of the requested size; each task builds on the previous ``fan_out`` tasks
+
+    The runner hands context entries to crewai unchanged and crewai expects Task
+    objects there, so dependencies are expressed in the task descriptions; the
+    sequential process already feeds earlier outputs into later prompts.
+    """
+    agent_configs = [
+        AgentConfig(
+            name=f"agent_{i}",
+            role=f"Benchmark role {i}",
+            goal="Produce deterministic benchmark output",
+            backstory="A synthetic agent used to measure engine overhead",
+            memory=False,
+            verbose=False,
+            tools=[f"bench_tool_{(i + j) % tools}" for j in range(min(tools, 2))] if tools else [],
+            max_rpm=100_000,
+        )
+        for i in range(agents)
+    ]
+    task_configs = []
+    for t in range(tasks):
+        depends_on = [f"task {d}" for d in range(max(0, t - fan_out), t)]
+        description = f"Benchmark task {t}."
+        if depends_on:
+            description += f" Combine the results of {', '.join(depends_on)}."
+        task_configs.append(TaskConfig(
+            description=description,
+            expected_output="A short deterministic summary",
+            agent_name=agent_configs[t % agents].name,
+        ))
+    return CrewConfig(
+        id=CREW_ID,
+        name="Benchmark crew",
+        agents=agent_configs,
+        tasks=task_configs,
+        memory=False,
+        verbose=False,
+        max_rpm=100_000,
+    )
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def make_handler(manager: WebSocketManager, config: CrewConfig) -> CrewCallbackHandler:
+    return CrewCallbackHandler(
+        websocket_manager=manager,
+        crew_id=CREW_ID,
+        run_id=RUN_ID,
+        agent_id_map={agent.name: agent.name for agent in config.agents},
+        task_id_map={task.description: task.description for task in config.tasks},
+    )
+
+def fire_event(handler: CrewCallbackHandler, config: CrewConfig, i: int) -> None:
+    """One callback from the cycle a task goes through"""
+    task_config = config.tasks[(i // 6) % len(config.tasks)]
+    agent = SimpleNamespace(name=task_config.agent_name)
+    task = SimpleNamespace(description=task_config.description)
+    step = i % 6
+    if step == 0:
+        handler.on_task_start(agent, task)
+    elif step == 1:
+        handler.on_chain_start(agent, task)
+    elif step == 2:
+        handler.on_tool_start(agent, "bench_tool_0", {"query": "benchmark"})
+    elif step == 3:
+        handler.on_tool_end(agent, "bench_tool_0", "bench_tool_0 result for benchmark")
+    elif step == 4:
+        handler.on_chain_end(agent, task, "Thought: I now know the final answer")
+    else:
+        handler.on_task_end(agent, task, "A short deterministic summary")
+
+async def bench_callbacks(config: CrewConfig, events: int) -> Dict:
+    handler = make_handler(WebSocketManager(), config)
+    start = time.perf_counter()
+    for i in range(events):
+        fire_event(handler, config, i)
+    elapsed = time.perf_counter() - start
+    return {"events": events, "no_subscribers_us": round(elapsed / events * 1e6, 3)}
+
+async def bench_broadcast(config: CrewConfig, clients: int, events: int, compression: bool) -> Dict:
+    manager = WebSocketManager()
+    sockets = [FakeWebSocket() for _ in range(clients)]
+    for websocket in sockets:
+        await manager.accept(websocket)
+        if compression:
+            manager.enable_compression(websocket)
+        await manager.subscribe(websocket, crew_topic(CREW_ID))
+    handler = make_handler(manager, config)
+
+    latencies = []
+    try:
+        for i in range(events):
+            expected = sum(websocket.frames for websocket in sockets) + clients
+            start = time.perf_counter()
+            fire_event(handler, config, i)
+            # The callback schedules the broadcast; wait until every client has the frame
+            while sum(websocket.frames for websocket in sockets) < expected:
+                await asyncio.sleep(0)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        # The manager is a process-wide singleton; later benchmarks must not fan out to these clients
+        for websocket in sockets:
+            await manager.disconnect(websocket)
+
+    return {
+        "clients": clients,
+        "events": events,
+        "compression": compression,
+        "p50_ms": round(percentile(latencies, 50) * 1e3, 4),
+        "p95_ms": round(percentile(latencies, 95) * 1e3, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1e3, 4),
+        "bytes_per_client_per_event": round(sum(ws.bytes for ws in sockets) / clients / events, 1),
+    }
+
+def phase_totals() -> Dict[str, float]:
+    values = execution_phase_seconds.values()
+    return {phase: values[(phase,)][1] if (phase,) in values else 0.0 for phase in SETUP_PHASES + ("kickoff",)}
+
+async def execute(config: CrewConfig, tool_service: ToolService, run: int):
+    runner = CrewRunner(
+        config=EngineConfig(),
+        websocket_manager=WebSocketManager(),
+        crew_id=CREW_ID,
+        tool_service=tool_service,
+        run_id=f"{RUN_ID}-{run}",
+    )
+    result = await runner.execute(config.model_copy(deep=True))
+    if result.status != "completed":
+        raise RuntimeError(f"Benchmark run failed: {result.error}")
+    return result
+
+async def bench_execution(config: CrewConfig, tool_service: ToolService, runs: int) -> Dict:
+    await execute(config, tool_service, -1)  # warm-up: imports, pydantic schemas, HTTP connections
+
+    setup, durations, llm_calls = [], [], []
+    for run in range(runs):
+        before, calls_before = phase_totals(), llm_server.calls
+        start = time.perf_counter()
+        await execute(config, tool_service, run)
+        durations.append(time.perf_counter() - start)
+        after = phase_totals()
+        setup.append({phase: after[phase] - before[phase] for phase in SETUP_PHASES})
+        llm_calls.append(llm_server.calls - calls_before)
+
+    setup_ms = {f"{phase}_ms": round(statistics.median(s[phase] for s in setup) * 1e3, 3) for phase in SETUP_PHASES}
+    setup_ms["total_ms"] = round(sum(setup_ms.values()), 3)
+    return {
+        "setup": setup_ms,
+        "execution": {
+            "runs": runs,
+            "p50_s": round(statistics.median(durations), 4),
+            "max_s": round(max(durations), 4),
+            "llm_calls_per_run": statistics.median(llm_calls),
+        },
+    }
+
+async def bench_memory(config: CrewConfig, tool_service: ToolService, concurrency: int) -> Dict:
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(execute(config, tool_service, 1000 + i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "concurrent_runs": concurrency,
+        "wall_s": round(elapsed, 4),
+        "peak_bytes_per_run": peak // concurrency,
+    }
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for section, keys in COMPARED.items():
+        for key in keys:
+            old = baseline.get(section, {}).get(key)
+            new = results.get(section, {}).get(key)
+            if old and new is not None and new > old * (1 + tolerance):
+                regressions.append(f"{section}.{key}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+async def run(args) -> int:
+    logging.getLogger("app").setLevel(args.log_level)
+    config = make_crew_config(args.agents, args.tasks, args.tools, args.fan_out)
+    tool_service = await make_tool_service(args.tools, args.tool_latency)
+
+    results: Dict = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "callbacks": await bench_callbacks(config, args.events),
+        "broadcast": await bench_broadcast(config, args.clients, args.events, args.compression),
+    }
+    results.update(await bench_execution(config, tool_service, args.runs))
+    results["memory"] = await bench_memory(config, tool_service, args.concurrency)
+    llm_server.stop()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    for section in ("callbacks", "broadcast", "setup", "execution", "memory"):
+        print(f"{section:<10} {json.dumps(results[section])}")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--tools", type=int, default=2, help="fake tools registered (each agent gets up to two)")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="seconds each fake tool call sleeps")
+    parser.add_argument("--fan-out", type=int, default=2, help="earlier tasks each task builds on")
+    parser.add_argument("--clients", type=int, default=100, help="simulated WebSocket subscribers")
+    parser.add_argument("--compression", action="store_true", help="subscribers ask for deflate frames")
+    parser.add_argument("--events", type=int, default=2000, help="callback events per callback/broadcast benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="sequential crew executions")
+    parser.add_argument("--concurrency", type=int, default=4, help="crew executions in flight for the memory benchmark")
+    parser.add_argument("--log-level", default="WARNING", help="level for app loggers while benchmarking")
+    parser.add_argument("--output", default="bench_engine.json")
+    parser.add_argument("--baseline", help="previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing, e.g. 0.2 = 20%%")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
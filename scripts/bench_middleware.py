@@ -0,0 +1,118 @@
+"""Microbenchmark of per-request middleware overhead.
+
+Drives a trivial FastAPI route directly over ASGI (no network, no server) and
+compares: no middleware, the previous five-layer stack of @app.middleware("http")
+/ BaseHTTPMiddleware wrappers (re-created here), and the single RequestMiddleware.
+
+    python scripts/bench_middleware.py [--requests 20000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.middleware.request import RequestMiddleware
+
+PATH = f"{settings.API_V1_STR}/v1/ping"
+
+def bare_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get(PATH)
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+def legacy_app() -> FastAPI:
+    """Same shape as the old stack: one BaseHTTPMiddleware and four function middlewares"""
+    app = bare_app()
+
+    class HealthGate(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            return await call_next(request)
+
+    async def error_handler(request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            raise
+
+    async def validation(request: Request, call_next):
+        start = time.time()
+        if not request.url.path.startswith(settings.API_V1_STR):
+            raise ValueError("unreachable in this benchmark")
+        response = await call_next(request)
+        _ = time.time() - start
+        return response
+
+    async def log_request(request: Request, call_next):
+        start = time.time()
+        request_id = request.headers.get("X-Request-ID", str(time.time()))
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = f"{time.time() - start:.3f}s"
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    async def cors_origin(request: Request, call_next):
+        request.headers.get("origin")
+        return await call_next(request)
+
+    app.add_middleware(HealthGate)
+    for middleware in (error_handler, validation, log_request, cors_origin):
+        app.middleware("http")(middleware)
+    return app
+
+def consolidated_app() -> FastAPI:
+    app = bare_app()
+    app.add_middleware(RequestMiddleware)
+    return app
+
+async def call(app, scope) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(scope), receive, send)
+
+async def measure(app, requests: int) -> list:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": PATH, "raw_path": PATH.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    for _ in range(min(1000, requests)):
+        await call(app, scope)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call(app, scope)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+async def run(requests: int) -> None:
+    results = {}
+    for label, factory in (("no middleware", bare_app), ("previous stack", legacy_app), ("RequestMiddleware", consolidated_app)):
+        timings = await measure(factory(), requests)
+        results[label] = statistics.median(timings)
+
+    baseline = results["no middleware"]
+    print(f"{'stack':<20}{'median/request':>16}{'overhead':>12}")
+    for label, median in results.items():
+        print(f"{label:<20}{median * 1e6:>13.1f} us{(median - baseline) * 1e6:>9.1f} us")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
@@ -0,0 +1,155 @@
+"""API worker cold-start benchmark: import time and memory.
+
+Starts fresh interpreters that import app.main the way a worker does and
+records the import time, peak RSS and whether crewai was loaded. Each then
+loads the execution engine (what PRELOAD_EXECUTION_ENGINE or the first
+execution pays) and, with --lifespan, runs the app's startup and shutdown,
+which needs the configured PostgreSQL.
+
+Results are written as JSON. With --baseline, the import time and RSS are
+compared to a previous result file and the script exits 1 when one grew by
+more than --tolerance.
+
+    python scripts/bench_startup.py [--runs 5] [--lifespan] [--top 15]
+        [--output bench_startup.json] [--baseline previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in each child interpreter; prints one JSON line
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import resource
+
+def rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+import app.main
+result = {"import_s": time.perf_counter() - start, "rss_mb": rss_mb(), "crewai_loaded": "crewai" in sys.modules}
+
+if {lifespan}:
+    import asyncio
+    async def lifespan():
+        async with app.main.app.router.lifespan_context(app.main.app):
+            pass
+    start = time.perf_counter()
+    asyncio.run(lifespan())
+    result["lifespan_s"] = time.perf_counter() - start
+
+start = time.perf_counter()
+try:
+    from app.engine import load_runner
+    load_runner()
+    result["engine_import_s"] = time.perf_counter() - start
+    result["engine_rss_mb"] = rss_mb()
+except ImportError as e:
+    result["engine_error"] = str(e)
+print(json.dumps(result))
+"""
+
+# Values where a larger number is a regression
+COMPARED = ("import_s", "rss_mb")
+
+def run_child(lifespan: bool, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CHILD.replace("{lifespan}", str(lifespan))]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    return subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+def heaviest_imports(stderr: str, top: int) -> List[Dict]:
+    """Packages that take longest to import, from -X importtime output
+
+    Sums each module's own (self) time into its top-level package, so a package
+    is not charged for what its imports load.
+    """
+    packages: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # header line
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": package, "ms": round(us / 1e3, 1)} for package, us in heaviest]
+
+def summarize(samples: List[Dict]) -> Dict:
+    summary: Dict = {"runs": len(samples), "crewai_loaded": any(s["crewai_loaded"] for s in samples)}
+    for key in ("import_s", "lifespan_s", "engine_import_s"):
+        values = [s[key] for s in samples if key in s]
+        if values:
+            summary[key] = round(statistics.median(values), 4)
+    for key in ("rss_mb", "engine_rss_mb"):
+        values = [s[key] for s in samples if key in s]
+        if values:
+            summary[key] = max(values)
+    errors = {s["engine_error"] for s in samples if "engine_error" in s}
+    if errors:
+        summary["engine_error"] = errors.pop()
+    return summary
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for key in COMPARED:
+        old, new = baseline.get("startup", {}).get(key), results["startup"].get(key)
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append(f"startup.{key}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+def run(args) -> int:
+    samples = []
+    for _ in range(args.runs):
+        completed = run_child(args.lifespan)
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    results: Dict = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "startup": summarize(samples),
+    }
+    if args.top:
+        results["heaviest_imports"] = heaviest_imports(run_child(False, importtime=True).stderr, args.top)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"startup  {json.dumps(results['startup'])}")
+    for entry in results.get("heaviest_imports", []):
+        print(f"  {entry['package']:<24} {entry['ms']:>9.1f} ms")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--lifespan", action="store_true", help="also time startup/shutdown (needs PostgreSQL)")
+    parser.add_argument("--top", type=int, default=15, help="heaviest imported packages to list (0 to skip)")
+    parser.add_argument("--output", default="bench_startup.json")
+    parser.add_argument("--baseline", help="previous result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed growth before a regression")
+    args = parser.parse_args()
+    sys.exit(run(args))
@@ -0,0 +1,105 @@
+"""Request-order check for tasks created through /tasks/bulk.
+
+Creates a scratch database next to the configured one, bulk-creates an agent
+and its steps in one request each, then checks that GET /tasks lists the tasks
+and a crew execution (against the stub LLM from scripts/fake_llm.py) runs
+them in the order they were sent. Rows of one bulk insert share a transaction,
+so this fails if they fall back to the same server-default created_at.
+Requires a reachable PostgreSQL from app settings and crewai. Install the script
+dependencies (httpx) with pip install -r scripts/requirements.txt.
+
+    python scripts/check_bulk_order.py [--tasks 12] [--keep]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import asyncpg
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_llm import FakeLLMServer, use_fake_llm
+from app.core.config import settings
+
+# The app's engine is created at import, so point it at the scratch database first
+DATABASE = settings.POSTGRES_DB = f"{settings.POSTGRES_DB}_bulkorder"
+settings.DB_CREATE_SCHEMA = True
+
+# The OpenAI clients read these when crewai is imported
+llm_server = FakeLLMServer()
+use_fake_llm(llm_server.start())
+
+from app.main import app
+
+API = "/api/v1"
+
+async def recreate_database(name: str, drop_only: bool = False) -> None:
+    conn = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT,
+        database='postgres'
+    )
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS {name}')
+        if not drop_only:
+            await conn.execute(f'CREATE DATABASE {name}')
+    finally:
+        await conn.close()
+
+async def post(client: httpx.AsyncClient, path: str, body=None) -> dict:
+    response = await client.post(f"{API}{path}", json=body)
+    response.raise_for_status()
+    return response.json()
+
+async def run(task_count: int, keep: bool) -> int:
+    await recreate_database(DATABASE)
+    checks = []
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bulkorder", timeout=None) as client:
+                crew_id = (await post(client, "/crews", {
+                    "name": "Bulk order", "description": "Steps created in one request",
+                    "memory": False, "verbose": False,
+                }))["id"]
+                agent_id = (await post(client, "/agents/bulk", {"crew_id": crew_id, "agents": [{
+                    "name": "Worker", "role": "Worker", "goal": "Work through {topic}", "backstory": "Methodical",
+                    "memory": False, "verbose": False, "max_iterations": 2,
+                }]}))["ids"][0]
+                # Descriptions are the keys of the execution output
+                descriptions = [f"Step {number}: summarize the previous findings" for number in range(1, task_count + 1)]
+                sent = (await post(client, "/tasks/bulk", {"tasks": [
+                    {"name": f"Step {number}", "description": description, "expected_output": "A short summary",
+                     "agent_id": agent_id, "crew_id": crew_id}
+                    for number, description in enumerate(descriptions, 1)
+                ]}))["ids"]
+
+                listed = [task["id"] for task in (await client.get(f"{API}/tasks", params={"limit": task_count})).json()]
+                checks.append(("listed in request order", listed == sent, listed))
+
+                executed = await client.post(f"{API}/crews/{crew_id}/execute", json={"inputs": {"topic": "ordering"}})
+                checks.append(("execution succeeds", executed.status_code == 200, executed.status_code))
+                if executed.status_code == 200:
+                    ran = list(executed.json()["output"]["tasks"])
+                    checks.append(("run in request order", ran == descriptions, ran))
+    finally:
+        llm_server.stop()
+        if not keep:
+            await recreate_database(DATABASE, drop_only=True)
+
+    failures = 0
+    for label, ok, detail in checks:
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}" + ("" if ok else f": {detail}"))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=12, help="tasks to create in the bulk request")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database afterwards")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.tasks, args.keep)))
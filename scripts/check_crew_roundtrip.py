@@ -0,0 +1,113 @@
+"""Export/import round-trip check for crews built through the regular API.
+
+Creates a scratch database next to the configured one, builds a crew the way
+the UI does (agents via /agents, tasks assigned to agents via /tasks without a
+crew_id, members via /crews/{id}/agents/{agent_id}), including repeated agent
+and task names. It then exports the crew, imports the document and exports the
+copy, and fails unless both documents match and hold every task the crew runs.
+Requires a reachable PostgreSQL from app settings. Install the script
+dependencies (httpx) with pip install -r scripts/requirements.txt.
+
+    python scripts/check_crew_roundtrip.py [--keep]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import asyncpg
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+
+# The app's engine is created at import, so point it at the scratch database first
+DATABASE = settings.POSTGRES_DB = f"{settings.POSTGRES_DB}_roundtrip"
+settings.DB_CREATE_SCHEMA = True
+
+from app.main import app
+
+API = "/api/v1"
+
+AGENTS = [
+    {"name": "Researcher", "role": "Researcher", "goal": "Research {topic}", "backstory": "Curious"},
+    {"name": "Researcher", "role": "Fact checker", "goal": "Check {topic}", "backstory": "Careful"},
+    {"name": "Writer", "role": "Writer", "goal": "Write about {topic}", "backstory": "Clear"},
+]
+
+async def recreate_database(name: str, drop_only: bool = False) -> None:
+    conn = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT,
+        database='postgres'
+    )
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS {name}')
+        if not drop_only:
+            await conn.execute(f'CREATE DATABASE {name}')
+    finally:
+        await conn.close()
+
+async def post(client: httpx.AsyncClient, path: str, body=None) -> dict:
+    response = await client.post(f"{API}{path}", json=body)
+    response.raise_for_status()
+    return response.json()
+
+async def build_crew(client: httpx.AsyncClient) -> str:
+    agent_ids = [(await post(client, "/agents", agent))["id"] for agent in AGENTS]
+    research = await post(client, "/tasks", {
+        "name": "Research", "description": "Research {topic}", "expected_output": "Notes",
+        "agent_id": agent_ids[0],
+    })
+    check = await post(client, "/tasks", {
+        "name": "Research", "description": "Check the notes on {topic}", "expected_output": "Checked notes",
+        "agent_id": agent_ids[1], "dependencies": [research["id"]],
+    })
+    await post(client, "/tasks", {
+        "name": "Write", "description": "Write an article on {topic}", "expected_output": "An article",
+        "agent_id": agent_ids[2], "dependencies": [research["id"], check["id"]],
+    })
+    crew_id = (await post(client, "/crews", {"name": "Round trip", "description": "Built through the API"}))["id"]
+    for agent_id in agent_ids:
+        await post(client, f"/crews/{crew_id}/agents/{agent_id}")
+    return crew_id
+
+async def run(keep: bool) -> int:
+    await recreate_database(DATABASE)
+    checks = []
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://roundtrip") as client:
+                crew_id = await build_crew(client)
+                exported = await client.get(f"{API}/crews/{crew_id}/export")
+                checks.append(("export succeeds", exported.status_code == 200, exported.status_code))
+                if exported.status_code == 200:
+                    document = exported.json()
+                    checks.append(("all agents exported", len(document["agents"]) == len(AGENTS), len(document["agents"])))
+                    checks.append(("all tasks exported", len(document["tasks"]) == 3, len(document["tasks"])))
+                    copy_id = (await post(client, "/crews/import", document))["id"]
+                    copy = (await client.get(f"{API}/crews/{copy_id}/export")).json()
+                    checks.append(("re-export matches", copy == document, "documents differ"))
+                    variables = [
+                        sorted((await client.get(f"{API}/crews/{id}/variables")).json()) for id in (crew_id, copy_id)
+                    ]
+                    checks.append(("same variables", variables[0] == variables[1], variables))
+    finally:
+        if not keep:
+            await recreate_database(DATABASE, drop_only=True)
+
+    failures = 0
+    for label, ok, detail in checks:
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}" + ("" if ok else f": {detail}"))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database afterwards")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.keep)))
@@ -0,0 +1,149 @@
+"""Query-plan regression check for the task/crew/agent lookup indexes.
+
+Creates a scratch database next to the configured one, seeds it (100k tasks by
+default), runs EXPLAIN on the queries the services issue and fails if any of
+them stops using its index. Requires a reachable PostgreSQL from app settings.
+start_api.sh runs it after the migrations unless SKIP_QUERY_PLAN_CHECK is set.
+
+    python scripts/check_query_plans.py [--tasks 100000] [--keep]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import asyncpg
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.database import Base
+from app.models.agent import Agent
+from app.models.crew import Crew, crew_agents
+from app.models.task import Task
+from app.utils.pagination import paginate, encode_cursor
+
+CREWS = 200
+AGENTS = 2000
+CREWS_PER_AGENT = 5
+
+SEED_SQL = [
+    """
+    INSERT INTO crews (id, name, description, created_at)
+    SELECT 'crew-' || i, 'Crew ' || i, 'Seeded crew', now() - i * interval '1 minute'
+    FROM generate_series(1, :crews) AS i
+    """,
+    """
+    INSERT INTO agents (id, name, role, goal, backstory, created_at)
+    SELECT 'agent-' || i, 'Agent ' || i, 'Researcher', 'Seeded goal', 'Seeded backstory',
+           now() - i * interval '1 minute'
+    FROM generate_series(1, :agents) AS i
+    """,
+    """
+    INSERT INTO crew_agents (crew_id, agent_id)
+    SELECT 'crew-' || (((i + k * 37) % :crews) + 1), 'agent-' || i
+    FROM generate_series(1, :agents) AS i, generate_series(0, :crews_per_agent - 1) AS k
+    """,
+    """
+    INSERT INTO tasks (id, name, description, expected_output, agent_id, crew_id, created_at)
+    SELECT 'task-' || i, 'Task ' || i, 'Seeded task', 'Seeded output',
+           'agent-' || ((i % :agents) + 1), 'crew-' || ((i % :crews) + 1),
+           now() - i * interval '1 second'
+    FROM generate_series(1, :tasks) AS i
+    """,
+]
+
+def scratch_database() -> str:
+    return f"{settings.POSTGRES_DB}_plancheck"
+
+async def recreate_database(name: str, drop_only: bool = False) -> None:
+    conn = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT,
+        database='postgres'
+    )
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS {name}')
+        if not drop_only:
+            await conn.execute(f'CREATE DATABASE {name}')
+    finally:
+        await conn.close()
+
+def index_names(plan) -> set:
+    """All index names referenced anywhere in an EXPLAIN (FORMAT JSON) plan tree"""
+    names = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            names.add(plan["Index Name"])
+        for value in plan.values():
+            names |= index_names(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            names |= index_names(item)
+    return names
+
+async def explain(conn, stmt) -> dict:
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[key] for key in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+async def run(tasks: int, keep: bool) -> int:
+    name = scratch_database()
+    await recreate_database(name)
+    uri = (
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{name}"
+    )
+    engine = create_async_engine(uri)
+    failures = 0
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            params = {"crews": CREWS, "agents": AGENTS, "crews_per_agent": CREWS_PER_AGENT, "tasks": tasks}
+            for sql in SEED_SQL:
+                await conn.execute(text(sql), params)
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            middle = (await conn.execute(
+                select(Task.created_at, Task.id).order_by(Task.created_at, Task.id).offset(tasks // 2).limit(1)
+            )).one()
+            checks = [
+                ("tasks by agent", select(Task).filter(Task.agent_id == "agent-17"), "ix_tasks_agent_id"),
+                ("tasks by crew", select(Task).filter(Task.crew_id == "crew-17"), "ix_tasks_crew_id"),
+                ("crews of an agent",
+                 select(Crew).join(crew_agents).filter(crew_agents.c.agent_id == "agent-17"),
+                 "ix_crew_agents_agent_id"),
+                ("agents of a crew",
+                 select(Agent).join(crew_agents).filter(crew_agents.c.crew_id == "crew-17"),
+                 "crew_agents_pkey"),
+                ("first task page", paginate(select(Task), Task, 100), "ix_tasks_created_at_id"),
+                ("deep task page",
+                 paginate(select(Task), Task, 100, encode_cursor(middle.created_at, middle.id)),
+                 "ix_tasks_created_at_id"),
+            ]
+            for label, stmt, expected in checks:
+                used = index_names(await explain(conn, stmt))
+                ok = expected in used
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {label}: expected {expected}, plan uses {sorted(used) or 'no index'}")
+    finally:
+        await engine.dispose()
+        if not keep:
+            await recreate_database(name, drop_only=True)
+
+    print(f"{len(checks) - failures}/{len(checks)} queries use their index ({tasks} tasks)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000, help="number of seeded tasks")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database afterwards")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.tasks, args.keep)))
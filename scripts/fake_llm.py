@@ -0,0 +1,193 @@
+"""Deterministic OpenAI-compatible chat completions server for offline runs.
+
+Answers every request locally, so crews can be executed end to end without
+network access or API cost. When the prompt offers tools, the first reply of
+an exchange calls one of them; once an observation or tool result is present
+it returns a final answer. Replies depend only on the prompt, and token usage
+is reported (about 4 characters per token), so crewai's token accounting works.
+
+    python scripts/fake_llm.py [--port 8999] [--latency 0.05]
+
+then point the app at it with OPENAI_API_BASE=http://127.0.0.1:8999/v1.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+WORDS = (
+    "analysis", "benchmark", "crew", "agent", "result", "summary", "insight", "data", "report",
+    "finding", "metric", "signal", "trend", "source", "evidence", "conclusion",
+)
+TOOL_NAME = re.compile(r"Tool Name: ([^\n,(]+)")
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def _answer(seed: str, words: int) -> str:
+    offset = int(hashlib.sha1(seed.encode()).hexdigest(), 16)
+    return " ".join(WORDS[(offset + i) % len(WORDS)] for i in range(words))
+
+class FakeLLM:
+    """Builds replies; shared by all request handler threads"""
+
+    def __init__(self, latency: float = 0.0, answer_words: int = 50):
+        self.latency = latency
+        self.answer_words = answer_words
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def reply(self, body: Dict) -> Tuple[Dict, Dict]:
+        """(assistant message, usage) for a chat completions request body"""
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        messages: List[Dict] = body.get("messages") or []
+        contents = [m.get("content") if isinstance(m.get("content"), str) else json.dumps(m.get("content")) for m in messages]
+        transcript = "\n".join(c or "" for c in contents)
+        last = contents[-1] if contents else ""
+        answer = _answer(transcript[:2000], self.answer_words)
+
+        message: Dict = {"role": "assistant", "content": None}
+        tools = body.get("tools") or []
+        if tools and not any(m.get("role") == "tool" for m in messages):
+            # Native function calling
+            name = tools[0].get("function", {}).get("name", "tool")
+            message["tool_calls"] = [{
+                "id": f"call_{self.calls}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps({"query": "benchmark"})},
+            }]
+        else:
+            tool_names = TOOL_NAME.findall(transcript)
+            if tool_names and "Observation:" not in last:
+                # ReAct-style prompt
+                message["content"] = (
+                    "Thought: I should look this up\n"
+                    f"Action: {tool_names[0].strip()}\n"
+                    'Action Input: {"query": "benchmark"}'
+                )
+            else:
+                message["content"] = f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+        completion = message["content"] or json.dumps(message.get("tool_calls"))
+        prompt_tokens, completion_tokens = _tokens(transcript), _tokens(completion)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return message, usage
+
+def _handler(llm: FakeLLM):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload: Dict, status: int = 200) -> None:
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                self._send_json({"object": "list", "data": [{"id": "fake-llm", "object": "model", "owned_by": "bench"}]})
+            else:
+                self._send_json({"error": {"message": "not found"}}, 404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json({"error": {"message": "not found"}}, 404)
+                return
+
+            message, usage = llm.reply(body)
+            model = body.get("model", "fake-llm")
+            created = int(time.time())
+            finish = "tool_calls" if message.get("tool_calls") else "stop"
+            if not body.get("stream"):
+                self._send_json({
+                    "id": f"chatcmpl-{llm.calls}", "object": "chat.completion", "created": created, "model": model,
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+                    "usage": usage,
+                })
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            base = {"id": f"chatcmpl-{llm.calls}", "object": "chat.completion.chunk", "created": created, "model": model}
+            delta = {k: v for k, v in message.items() if v is not None}
+            if delta.get("tool_calls"):
+                delta["tool_calls"] = [dict(call, index=i) for i, call in enumerate(delta["tool_calls"])]
+            for chunk in (
+                {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]},
+                {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": finish}], "usage": usage},
+            ):
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+    return Handler
+
+class FakeLLMServer:
+    """Runs FakeLLM over HTTP in a background thread"""
+
+    def __init__(self, latency: float = 0.0, answer_words: int = 50, host: str = "127.0.0.1", port: int = 0):
+        self.llm = FakeLLM(latency, answer_words)
+        self._server = ThreadingHTTPServer((host, port), _handler(self.llm))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def calls(self) -> int:
+        return self.llm.calls
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+def use_fake_llm(base_url: str, model: str = "gpt-4o-mini") -> None:
+    """Point the OpenAI clients used by crewai (LiteLLM or langchain) at the fake server"""
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    os.environ.setdefault("OPENAI_MODEL_NAME", model)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each reply")
+    parser.add_argument("--answer-words", type=int, default=50)
+    args = parser.parse_args()
+    server = FakeLLMServer(args.latency, args.answer_words, args.host, args.port)
+    print(f"Fake LLM listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,261 @@
+"""API load test against a seeded local PostgreSQL.
+
+Creates a scratch database next to the configured one and seeds it with
+thousands of crews, agents and tasks, then drives the app in-process over ASGI
+(httpx, no network, no server) with the stub LLM from scripts/fake_llm.py.
+For each endpoint it reports p50/p95/p99 latency, throughput and the number
+of DB queries per request, so service-layer changes get before/after numbers.
+Requests over their DB_QUERY_BUDGET/DB_QUERY_BUDGETS budget fail the run.
+Requires a reachable PostgreSQL from app settings. Install the script
+dependencies (httpx) with pip install -r scripts/requirements.txt.
+
+    python scripts/load_test.py [--crews 2000] [--agents 10000] [--tasks 40000]
+        [--requests 500] [--executions 40] [--concurrency 16] [--output load_test.json] [--keep]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+import httpx
+from sqlalchemy import text
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_llm import FakeLLMServer, use_fake_llm
+from app.core.config import settings
+
+# The app's engine is created at import, so point it at the scratch database first
+DATABASE = settings.POSTGRES_DB = f"{settings.POSTGRES_DB}_loadtest"
+settings.DB_CREATE_SCHEMA = True
+
+# The OpenAI clients read these when crewai is imported
+llm_server = FakeLLMServer()
+use_fake_llm(llm_server.start())
+
+from app.core.database import engine
+from app.core.query_stats import count_queries, query_budget
+from app.main import app
+
+API = "/api/v1"
+EXECUTION_CREWS = 20
+CREWS_PER_AGENT = 2
+
+# Seeded tasks belong to a crew their agent is a member of, so variables resolve.
+# Execution crews get their own two agents with one task each, since a crew runs
+# every task of its agents and the shared seed agents have many.
+SEED_SQL = [
+    """
+    INSERT INTO crews (id, name, description, memory, verbose, created_at)
+    SELECT 'crew-' || i, 'Crew ' || i, 'Seeded crew', false, false, now() - i * interval '1 minute'
+    FROM generate_series(1, :crews) AS i
+    """,
+    """
+    INSERT INTO agents (id, name, role, goal, backstory, memory, verbose, created_at)
+    SELECT 'agent-' || i, 'Agent ' || i, 'Researcher', 'Research {topic}', 'Seeded backstory', false, false,
+           now() - i * interval '1 minute'
+    FROM generate_series(1, :agents) AS i
+    """,
+    """
+    INSERT INTO crew_agents (crew_id, agent_id)
+    SELECT 'crew-' || (((i + k * 37) % :crews) + 1), 'agent-' || i
+    FROM generate_series(1, :agents) AS i, generate_series(0, :crews_per_agent - 1) AS k
+    """,
+    """
+    INSERT INTO tasks (id, name, description, expected_output, agent_id, crew_id, created_at)
+    SELECT 'task-' || i, 'Task ' || i, 'Summarize {topic} for seeded task ' || i, 'A short summary',
+           'agent-' || ((i % :agents) + 1), 'crew-' || ((((i % :agents) + 1) % :crews) + 1),
+           now() - i * interval '1 second'
+    FROM generate_series(1, :tasks) AS i
+    """,
+    """
+    INSERT INTO crews (id, name, description, memory, verbose)
+    SELECT 'exec-crew-' || i, 'Execution crew ' || i, 'Seeded crew for /execute', false, false
+    FROM generate_series(1, :execution_crews) AS i
+    """,
+    """
+    INSERT INTO agents (id, name, role, goal, backstory, memory, verbose, max_iterations)
+    SELECT 'exec-agent-' || i || '-' || k, 'Execution agent ' || i || '-' || k, 'Researcher',
+           'Research {topic}', 'Seeded backstory', false, false, 2
+    FROM generate_series(1, :execution_crews) AS i, generate_series(1, 2) AS k
+    """,
+    """
+    INSERT INTO crew_agents (crew_id, agent_id)
+    SELECT 'exec-crew-' || i, 'exec-agent-' || i || '-' || k
+    FROM generate_series(1, :execution_crews) AS i, generate_series(1, 2) AS k
+    """,
+    """
+    INSERT INTO tasks (id, name, description, expected_output, agent_id, crew_id)
+    SELECT 'exec-task-' || i || '-' || k, 'Execution task ' || k, 'Step ' || k || ': summarize {topic}',
+           'A short summary', 'exec-agent-' || i || '-' || k, 'exec-crew-' || i
+    FROM generate_series(1, :execution_crews) AS i, generate_series(1, 2) AS k
+    """,
+]
+
+async def recreate_database(name: str, drop_only: bool = False) -> None:
+    conn = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT,
+        database='postgres'
+    )
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS {name}')
+        if not drop_only:
+            await conn.execute(f'CREATE DATABASE {name}')
+    finally:
+        await conn.close()
+
+async def seed(crews: int, agents: int, tasks: int) -> None:
+    params = {
+        "crews": crews,
+        "agents": agents,
+        "crews_per_agent": CREWS_PER_AGENT,
+        "tasks": tasks,
+        "execution_crews": EXECUTION_CREWS,
+    }
+    async with engine.begin() as conn:
+        for sql in SEED_SQL:
+            await conn.execute(text(sql), params)
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def drive(client: httpx.AsyncClient, method: str, route: str, make_path: Callable[[int], str],
+                requests: int, concurrency: int, body: Optional[Dict] = None) -> Dict:
+    """Send ``requests`` calls from ``concurrency`` workers; latency, status and query stats"""
+    latencies: List[float] = []
+    queries: List[int] = []
+    statuses: Dict[str, int] = {}
+    numbers = iter(range(requests))
+
+    async def worker():
+        for number in numbers:
+            # Each worker task has its own context, so only this request's statements are counted
+            with count_queries(engine.sync_engine) as stats:
+                start = time.perf_counter()
+                response = await client.request(method, make_path(number), json=body)
+            latencies.append(time.perf_counter() - start)
+            queries.append(stats.count)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    budget = query_budget(method, route)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "status": statuses,
+        "throughput_rps": round(requests / wall, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+        "max_ms": round(latencies[-1] * 1e3, 3),
+        "queries_per_request": round(statistics.mean(queries), 2),
+        "queries_max": max(queries),
+        "query_budget": budget,
+        "over_budget": sum(count > budget for count in queries) if budget else 0,
+    }
+
+async def run(args) -> int:
+    rng = random.Random(args.seed)
+    crew_ids = [f"crew-{rng.randint(1, args.crews)}" for _ in range(args.requests)]
+    calls_before = llm_server.calls
+
+    # (name, method, route template for the query budget, path, requests, body)
+    endpoints = [
+        ("GET /crews", "GET", f"{API}/crews", lambda n: f"{API}/crews?limit={args.page_size}", args.requests, None),
+        ("GET /agents", "GET", f"{API}/agents", lambda n: f"{API}/agents?limit={args.page_size}", args.requests, None),
+        ("GET /tasks", "GET", f"{API}/tasks", lambda n: f"{API}/tasks?limit={args.page_size}", args.requests, None),
+        ("GET /tools", "GET", f"{API}/tools", lambda n: f"{API}/tools", args.requests, None),
+        ("GET /crews/{id}/variables", "GET", f"{API}/crews/{{crew_id}}/variables",
+         lambda n: f"{API}/crews/{crew_ids[n]}/variables", args.requests, None),
+        ("POST /crews/{id}/execute", "POST", f"{API}/crews/{{crew_id}}/execute",
+         lambda n: f"{API}/crews/exec-crew-{n % EXECUTION_CREWS + 1}/execute", args.executions,
+         {"inputs": {"topic": "load testing"}}),
+    ]
+
+    await recreate_database(DATABASE)
+    results: Dict = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "endpoints": {},
+    }
+    try:
+        # The lifespan creates the tables and starts the health probe and WebSocket reaper
+        async with app.router.lifespan_context(app):
+            seed_start = time.perf_counter()
+            await seed(args.crews, args.agents, args.tasks)
+            results["meta"]["seed_s"] = round(time.perf_counter() - seed_start, 2)
+            print(f"Seeded {args.crews} crews, {args.agents} agents, {args.tasks} tasks "
+                  f"in {results['meta']['seed_s']}s")
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+                for name, method, route, make_path, requests, body in endpoints:
+                    if requests <= 0:
+                        continue
+                    # One unmeasured call so first-use costs (imports, caches) stay out of the numbers
+                    await client.request(method, make_path(0), json=body)
+                    stats = await drive(client, method, route, make_path, requests, args.concurrency, body)
+                    results["endpoints"][name] = stats
+                    print(f"{name:<28} {json.dumps(stats)}")
+    finally:
+        llm_server.stop()
+        if not args.keep:
+            await recreate_database(DATABASE, drop_only=True)
+
+    results["meta"]["llm_calls"] = llm_server.calls - calls_before
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    failed = {
+        name: stats["status"] for name, stats in results["endpoints"].items()
+        if any(not status.startswith("2") for status in stats["status"])
+    }
+    for name, statuses in failed.items():
+        print(f"ERRORS {name}: {statuses}")
+    over_budget = {name: stats for name, stats in results["endpoints"].items() if stats["over_budget"]}
+    for name, stats in over_budget.items():
+        print(f"OVER BUDGET {name}: {stats['over_budget']} requests above {stats['query_budget']} "
+              f"statements (max {stats['queries_max']})")
+    return 1 if failed or over_budget else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--crews", type=int, default=2000)
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=40_000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per read endpoint")
+    parser.add_argument("--executions", type=int, default=40, help="requests to /execute (0 to skip)")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight per endpoint")
+    parser.add_argument("--page-size", type=int, default=100, help="limit for the list endpoints")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the crews picked")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database afterwards")
+    parser.add_argument("--log-level", default="WARNING", help="level for the app loggers during the run")
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(args.log_level)
+    sys.exit(asyncio.run(run(args)))
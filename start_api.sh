@@ -12,9 +12,16 @@ fi
 # Install dependencies if needed
 pip install -r app/requirements.txt
 
-# Run migrations
-#alembic upgrade head
-
-# Set PYTHONPATH and start the FastAPI server
 export PYTHONPATH=$PYTHONPATH:$(pwd)
+
+# Create the database if needed and run migrations
+python -c "import asyncio; from app.core.database import ensure_database_exists; asyncio.run(ensure_database_exists())"
+alembic upgrade head
+
+# Fail fast when a lookup query stops using its index (seeds a scratch database; set SKIP_QUERY_PLAN_CHECK=1 to skip)
+if [ -z "$SKIP_QUERY_PLAN_CHECK" ]; then
+    python scripts/check_query_plans.py || exit 1
+fi
+
+# Start the FastAPI server
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload 
\ No newline at end of file